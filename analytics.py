@@ -0,0 +1,146 @@
+import csv
+import json
+import math
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-size circular buffer backed by a preallocated NumPy array"""
+
+    def __init__(self, capacity, shape=(), dtype=np.float64):
+        self.capacity = max(1, int(capacity))
+        self.data = np.zeros((self.capacity,) + tuple(shape), dtype=dtype)
+        self.index = 0  # next write position
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, value):
+        """Overwrite the oldest slot with value"""
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def values(self):
+        """Return stored values ordered oldest -> newest"""
+        if self.size < self.capacity:
+            return self.data[:self.size]
+        return np.concatenate((self.data[self.index:], self.data[:self.index]))
+
+    def clear(self):
+        self.index = 0
+        self.size = 0
+
+
+class StreamingClassStats:
+    """
+    Per-class detection counts over a video stream.
+
+    Every frame's class ids are reduced with a single bincount. Lifetime
+    totals live in fixed-length arrays and the last `window_seconds` of
+    per-frame counts live in ring buffers sized from the source frame rate,
+    so memory stays constant however long the stream runs.
+    """
+
+    def __init__(self, names, window_seconds=10.0, fps=30.0):
+        self.names = dict(names)
+        self.num_classes = max(self.names) + 1 if self.names else 0
+        self.window_seconds = window_seconds
+        self.fps = fps if fps and fps > 0 else 30.0
+
+        capacity = math.ceil(window_seconds * self.fps) + 1
+        self.times = RingBuffer(capacity)
+        self.counts = RingBuffer(capacity, (self.num_classes,), np.int32)
+
+        self.totals = np.zeros(self.num_classes, dtype=np.int64)
+        self.frames_present = np.zeros(self.num_classes, dtype=np.int64)
+        self.peak = np.zeros(self.num_classes, dtype=np.int32)
+        self.frames = 0
+        self.first_time = None
+        self.last_time = None
+
+    def update(self, cls_ids, timestamp):
+        """Add one frame's class ids (any int array-like) at `timestamp` seconds"""
+        cls_ids = np.asarray(cls_ids, dtype=np.int64).ravel()
+        counts = np.bincount(cls_ids, minlength=self.num_classes)[:self.num_classes]
+
+        self.totals += counts
+        self.frames_present += counts > 0
+        np.maximum(self.peak, counts, out=self.peak)
+        self.frames += 1
+
+        self.times.append(timestamp)
+        self.counts.append(counts)
+        if self.first_time is None:
+            self.first_time = timestamp
+        self.last_time = timestamp
+        return counts
+
+    def window(self):
+        """Return (times, counts) for frames inside the rolling window"""
+        times = self.times.values()
+        counts = self.counts.values()
+        if not len(times):
+            return times, counts
+        mask = times >= times[-1] - self.window_seconds
+        return times[mask], counts[mask]
+
+    def window_stats(self):
+        """Return per-class mean, max and occupancy over the rolling window"""
+        _, counts = self.window()
+        if not len(counts):
+            zeros = np.zeros(self.num_classes)
+            return zeros, zeros.astype(np.int32), zeros
+        return counts.mean(axis=0), counts.max(axis=0), (counts > 0).mean(axis=0)
+
+    def top_classes(self, limit=5):
+        """Class ids seen in the rolling window, most frequent first"""
+        _, counts = self.window()
+        if not len(counts):
+            return []
+        sums = counts.sum(axis=0)
+        order = np.argsort(sums)[::-1][:limit]
+        return [int(i) for i in order if sums[i] > 0]
+
+    def summary(self):
+        """Return a JSON-serialisable summary of the whole run"""
+        duration = (self.last_time - self.first_time) if self.frames else 0.0
+        mean, peak, occupancy = self.window_stats()
+        classes = []
+        for cls_id in np.flatnonzero(self.totals):
+            classes.append({
+                'class': self.names.get(int(cls_id), str(cls_id)),
+                'total': int(self.totals[cls_id]),
+                'mean_per_frame': round(float(self.totals[cls_id] / self.frames), 3),
+                'peak': int(self.peak[cls_id]),
+                'occupancy': round(float(self.frames_present[cls_id] / self.frames), 3),
+                'window_mean': round(float(mean[cls_id]), 3),
+                'window_max': int(peak[cls_id]),
+                'window_occupancy': round(float(occupancy[cls_id]), 3)
+            })
+        classes.sort(key=lambda c: c['total'], reverse=True)
+
+        return {
+            'frames': self.frames,
+            'duration_s': round(float(duration), 2),
+            'window_s': self.window_seconds,
+            'total_detections': int(self.totals.sum()),
+            'classes': classes
+        }
+
+    def export(self, file_path):
+        """Write the summary as JSON, or as one CSV row per class"""
+        summary = self.summary()
+        if str(file_path).lower().endswith('.csv'):
+            fields = ['class', 'total', 'mean_per_frame', 'peak', 'occupancy',
+                      'window_mean', 'window_max', 'window_occupancy']
+            with open(file_path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(summary['classes'])
+        else:
+            with open(file_path, 'w') as f:
+                json.dump(summary, f, indent=2)
+        return summary
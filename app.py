@@ -2,10 +2,23 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
 import cv2
+import json
+import numpy as np
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 
+from analytics import StreamingClassStats
+from compare import match_detections
+from detections import Detections
+from gallery import ThumbnailGallery
+from roi import RoiStore, detect_rois, draw_detections
+from dedup import DEFAULT_THRESHOLD, MAX_FRAME_REUSE, DedupCache, dhash, dhash_file
+from video_io import RecordingSource, open_source
+from quantize import QUANT_CACHE_DIR, compare_quantized, format_report, load_quantized
+
 try:
     from ultralytics import YOLO
 except ImportError:
@@ -28,13 +41,33 @@ COLORS = {
     'border': '#404040'
 }
 
+# Line colors for the live per-class chart
+CHART_COLORS = ['#4ec9b0', '#007acc', '#ce9178', '#c586c0', '#dcdcaa']
+
+ANALYTICS_WINDOW_SECONDS = 10.0
+CHART_REFRESH_FRAMES = 5
+
+# Memory-bounded session limits
+BOUNDED_MAX_CARDS = 30
+
+# Background detections kept for gallery neighbours
+PREDETECT_CACHE_SIZE = 8
+
+# Decoded frames buffered ahead of inference
+VIDEO_PREFETCH_FRAMES = 8
+
+# Replay speed for recorded frame logs
+PACING_OPTIONS = {'Real-time': 'realtime', '2x': 2.0, '4x': 4.0, 'Fast': 'fast'}
+RECORDINGS_DIR = Path('recordings')
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.framelog')
+
 class YOLODetectorApp:
     """
     YOLO Object Detection - Tkinter GUI Application (Dark Mode)
     Supports image and video detection with trained Pascal VOC model
     """
     
-    def __init__(self, root):
+    def __init__(self, root, model_path=None):
         self.root = root
         self.root.title("YOLO Object Detection - Dark Mode")
         self.root.geometry("1400x850")
@@ -42,12 +75,30 @@ class YOLODetectorApp:
         
         # Variables
         self.model = None
+        self.model_generation = 0  # bumped on every model switch, keys detection caches
         self.model_path = None
+        self.fp32_model = None
+        self.int8_model = None
+        self.model_b = None
+        self.model_b_path = None
+        self.ab_executor = None
+        self.gallery = None
+        self.predetect_executor = None
+        self.predetect_cache = OrderedDict()
+        self.predict_lock = threading.Lock()
+        self.roi_store = RoiStore()
+        self.dedup = DedupCache()
+        self.rois = []  # normalized (x1, y1, x2, y2) for the current source
+        self.roi_drag = None
+        self.display_geometry = None  # (x0, y0, width, height) of the shown frame
         self.current_file = None
         self.video_thread = None
         self.stop_video = False
         self.is_processing = False
-        self.detection_data = []
+        self.detection_data = None  # Detections of the last displayed frame
+        self.result_pool = None  # bounded mode: result widgets reused across frames
+        self.analytics = None
+        self.photo = None
         
         # Pascal VOC classes
         self.voc_classes = [
@@ -63,8 +114,15 @@ class YOLODetectorApp:
         # Setup UI
         self.setup_ui()
         
-        # Auto-load model from models folder
-        self.auto_load_model()
+        # Stop background work before the window goes away
+        self.closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Load the given model, or auto-load from models folder
+        if model_path:
+            self.load_model_file(model_path)
+        else:
+            self.auto_load_model()
         
     def setup_dark_theme(self):
         """Configure dark theme for ttk widgets"""
@@ -86,6 +144,15 @@ class YOLODetectorApp:
                        bordercolor=COLORS['border'], darkcolor=COLORS['bg_light'],
                        lightcolor=COLORS['accent'])
         
+        style.configure('TCheckbutton', background=COLORS['bg'], foreground=COLORS['fg'],
+                       indicatorbackground=COLORS['bg_light'], indicatorforeground=COLORS['accent'])
+        style.map('TCheckbutton', background=[('active', COLORS['bg'])])
+        
+        style.configure('TSpinbox', fieldbackground=COLORS['bg_light'], foreground=COLORS['fg'],
+                       background=COLORS['bg_lighter'], arrowcolor=COLORS['fg'])
+        style.configure('TCombobox', fieldbackground=COLORS['bg_light'], foreground=COLORS['fg'],
+                       background=COLORS['bg_lighter'], arrowcolor=COLORS['fg'])
+        
         style.configure('Accent.TButton', background=COLORS['accent'], foreground=COLORS['fg'],
                        font=('Arial', 10, 'bold'))
         style.map('Accent.TButton', background=[('active', COLORS['accent_hover'])])
@@ -119,12 +186,30 @@ class YOLODetectorApp:
         ttk.Button(model_info_frame, text="🔄 Reload", 
                   command=self.reload_model).pack(side=tk.LEFT, padx=5)
         
+        self.int8_var = tk.BooleanVar(value=False)
+        self.int8_check = ttk.Checkbutton(model_info_frame, text="⚡ INT8 (CPU)", 
+                                          variable=self.int8_var, command=self.toggle_quantized)
+        self.int8_check.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(model_info_frame, text="📏 Compare FP32/INT8", 
+                  command=self.compare_quantized).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(model_info_frame, text="🆚 A/B Model", 
+                  command=self.load_model_b).pack(side=tk.LEFT, padx=5)
+        self.model_b_label = ttk.Label(model_info_frame, text="B: none", font=('Arial', 9))
+        self.model_b_label.pack(side=tk.LEFT, padx=5)
+        self.clear_b_btn = ttk.Button(model_info_frame, text="✖", width=3, 
+                                      command=self.clear_model_b, state=tk.DISABLED)
+        self.clear_b_btn.pack(side=tk.LEFT)
+        
         # Quick actions frame
         actions_frame = ttk.LabelFrame(top_frame, text="📁 Quick Actions", padding="10")
         actions_frame.pack(side=tk.RIGHT, padx=(5, 0))
         
         ttk.Button(actions_frame, text="🖼️ Image", 
                   command=self.upload_image, width=12, style='Accent.TButton').pack(side=tk.LEFT, padx=3)
+        ttk.Button(actions_frame, text="🗂️ Folder", 
+                  command=self.open_folder, width=12, style='Accent.TButton').pack(side=tk.LEFT, padx=3)
         ttk.Button(actions_frame, text="🎬 Video", 
                   command=self.upload_video, width=12, style='Accent.TButton').pack(side=tk.LEFT, padx=3)
         ttk.Button(actions_frame, text="📹 Webcam", 
@@ -182,6 +267,57 @@ class YOLODetectorApp:
         self.iou_label.pack(side=tk.LEFT)
         self.iou_var.trace('w', self.update_iou_label)
         
+        # Video range / sampling
+        video_frame = ttk.Frame(settings_frame)
+        video_frame.pack(side=tk.LEFT, padx=10)
+        
+        ttk.Label(video_frame, text="Video (start s / end s / every Nth / max px):", 
+                  font=('Arial', 9)).pack(anchor=tk.W)
+        video_opts_frame = ttk.Frame(video_frame)
+        video_opts_frame.pack(fill=tk.X)
+        
+        self.start_var = tk.DoubleVar(value=0.0)
+        ttk.Spinbox(video_opts_frame, from_=0, to=86400, increment=1, width=6, 
+                    textvariable=self.start_var).pack(side=tk.LEFT, padx=(0, 3))
+        self.end_var = tk.DoubleVar(value=0.0)  # 0 = until the end
+        ttk.Spinbox(video_opts_frame, from_=0, to=86400, increment=1, width=6, 
+                    textvariable=self.end_var).pack(side=tk.LEFT, padx=3)
+        self.stride_var = tk.IntVar(value=1)
+        ttk.Spinbox(video_opts_frame, from_=1, to=300, increment=1, width=4, 
+                    textvariable=self.stride_var).pack(side=tk.LEFT, padx=3)
+        self.max_size_var = tk.StringVar(value="Off")
+        ttk.Combobox(video_opts_frame, textvariable=self.max_size_var, width=5, state='readonly',
+                     values=("Off", "1920", "1280", "960", "640")).pack(side=tk.LEFT, padx=3)
+        
+        # Session
+        session_frame = ttk.Frame(settings_frame)
+        session_frame.pack(side=tk.LEFT, padx=10)
+        
+        ttk.Label(session_frame, text="Session:", font=('Arial', 9)).pack(anchor=tk.W)
+        self.bounded_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(session_frame, text="🔒 Bounded memory (long runs)", 
+                        variable=self.bounded_var).pack(anchor=tk.W)
+        
+        record_frame = ttk.Frame(session_frame)
+        record_frame.pack(anchor=tk.W)
+        self.record_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(record_frame, text="⏺ Record webcam", 
+                        variable=self.record_var).pack(side=tk.LEFT)
+        ttk.Label(record_frame, text="Replay:", font=('Arial', 9)).pack(side=tk.LEFT, padx=(10, 3))
+        self.pacing_var = tk.StringVar(value='Real-time')
+        ttk.Combobox(record_frame, textvariable=self.pacing_var, width=9, state='readonly',
+                     values=tuple(PACING_OPTIONS)).pack(side=tk.LEFT)
+        
+        dedup_frame = ttk.Frame(session_frame)
+        dedup_frame.pack(anchor=tk.W)
+        self.dedup_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(dedup_frame, text="♻ Skip near-duplicates", 
+                        variable=self.dedup_var).pack(side=tk.LEFT)
+        ttk.Label(dedup_frame, text="max bits:", font=('Arial', 9)).pack(side=tk.LEFT, padx=(10, 3))
+        self.dedup_threshold_var = tk.IntVar(value=DEFAULT_THRESHOLD)
+        ttk.Spinbox(dedup_frame, from_=0, to=16, increment=1, width=4, 
+                    textvariable=self.dedup_threshold_var).pack(side=tk.LEFT)
+        
         # Action buttons
         action_frame = ttk.Frame(control_frame)
         action_frame.pack(fill=tk.X)
@@ -203,21 +339,40 @@ class YOLODetectorApp:
                                    command=self.save_result, state=tk.DISABLED)
         self.save_btn.pack(side=tk.LEFT, padx=5)
         
+        self.export_btn = ttk.Button(action_frame, text="📈 Export Analytics", 
+                                     command=self.export_analytics, state=tk.DISABLED)
+        self.export_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.roi_edit_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(action_frame, text="✏️ Draw ROI", 
+                        variable=self.roi_edit_var).pack(side=tk.LEFT, padx=(15, 5))
+        
+        self.clear_roi_btn = ttk.Button(action_frame, text="🧹 Clear ROIs", 
+                                        command=self.clear_rois, state=tk.DISABLED)
+        self.clear_roi_btn.pack(side=tk.LEFT, padx=5)
+        
         # ============================================================
         # Main Content Area - Display & Results
         # ============================================================
         content_frame = ttk.Frame(self.root)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.content_frame = content_frame
         
         # Left side - Image/Video Display
         left_frame = ttk.LabelFrame(content_frame, text="📺 Display", padding="10")
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        self.left_frame = left_frame
         
         # Canvas for image/video
         self.canvas = tk.Canvas(left_frame, bg=COLORS['bg_light'], 
                                highlightbackground=COLORS['border'], highlightthickness=1)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
+        # ROI drawing
+        self.canvas.bind('<ButtonPress-1>', self.on_canvas_press)
+        self.canvas.bind('<B1-Motion>', self.on_canvas_drag)
+        self.canvas.bind('<ButtonRelease-1>', self.on_canvas_release)
+        
         # Add placeholder text
         self.canvas_text = self.canvas.create_text(
             400, 300,
@@ -231,6 +386,11 @@ class YOLODetectorApp:
         self.progress = ttk.Progressbar(left_frame, mode='indeterminate')
         self.progress.pack(fill=tk.X, pady=(5, 0))
         
+        # Live per-class chart (video only)
+        self.chart_canvas = tk.Canvas(left_frame, bg=COLORS['bg_light'], height=110,
+                                      highlightbackground=COLORS['border'], highlightthickness=1)
+        self.chart_canvas.pack(fill=tk.X, pady=(5, 0))
+        
         # Right side - Detection Results
         right_frame = ttk.LabelFrame(content_frame, text="📊 Detection Results", padding="10")
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=(5, 0))
@@ -335,8 +495,11 @@ class YOLODetectorApp:
         """Load model from given path"""
         try:
             self.update_status("Loading model...", COLORS['warning'])
-            self.model = YOLO(file_path)
+            self.fp32_model = YOLO(file_path)
+            self.use_model(self.fp32_model)
             self.model_path = file_path
+            self.int8_model = None
+            self.int8_var.set(False)
             
             model_name = Path(file_path).name
             
@@ -352,6 +515,12 @@ class YOLODetectorApp:
             self.model_label.config(text="❌ Failed to load", style='Error.TLabel')
             self.update_status("Error loading model", COLORS['error'])
     
+    def use_model(self, model):
+        """Make model the active one; cached detections of the previous model are dropped"""
+        self.model = model
+        self.model_generation += 1
+        self.predetect_cache.clear()
+    
     def reload_model(self):
         """Reload the current model"""
         if self.model_path:
@@ -359,6 +528,144 @@ class YOLODetectorApp:
         else:
             messagebox.showinfo("Info", "No model to reload. Please load a model first.")
     
+    def load_model_b(self):
+        """Load a second model for side-by-side A/B comparison"""
+        if not self.model:
+            messagebox.showwarning("Warning", "Please load model A first!")
+            return
+        
+        file_path = filedialog.askopenfilename(
+            title="Select Model B",
+            filetypes=[("PyTorch Models", "*.pt"), ("All files", "*.*")],
+            initialdir="models" if Path("models").exists() else "."
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            self.update_status("Loading model B...", COLORS['warning'])
+            self.model_b = YOLO(file_path)
+            self.model_b_path = file_path
+            
+            model_name = Path(file_path).name
+            self.model_b_label.config(text=f"B: {model_name}", style='Success.TLabel')
+            self.clear_b_btn.config(state=tk.NORMAL)
+            self.update_status(f"A/B mode: {Path(self.model_path).name} vs {model_name}", COLORS['success'])
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load model B:\n{str(e)}")
+            self.update_status("Error loading model B", COLORS['error'])
+    
+    def clear_model_b(self):
+        """Leave A/B mode"""
+        self.model_b = None
+        self.model_b_path = None
+        self.model_b_label.config(text="B: none", style='TLabel')
+        self.clear_b_btn.config(state=tk.DISABLED)
+        self.update_status("A/B mode off", COLORS['fg_dim'])
+    
+    def toggle_quantized(self):
+        """Switch between the FP32 model and its cached INT8 variant"""
+        if not self.fp32_model:
+            self.int8_var.set(False)
+            messagebox.showwarning("Warning", "Please load a model first!")
+            return
+        
+        model_name = Path(self.model_path).name
+        if not self.int8_var.get():
+            self.use_model(self.fp32_model)
+            self.model_label.config(text=f"✓ {model_name}", style='Success.TLabel')
+            self.update_status(f"Using FP32 model: {model_name}", COLORS['success'])
+            return
+        
+        if self.int8_model:
+            self.use_model(self.int8_model)
+            self.model_label.config(text=f"✓ {model_name} [INT8]", style='Success.TLabel')
+            self.update_status(f"Using INT8 model: {model_name}", COLORS['success'])
+            return
+        
+        # First use - export and quantize in the background
+        self.int8_check.config(state=tk.DISABLED)
+        self.progress.start()
+        self.update_status("Creating INT8 model (first time only)...", COLORS['warning'])
+        threading.Thread(target=self.build_quantized, args=(self.model_path,), daemon=True).start()
+    
+    def build_quantized(self, model_path):
+        """Create or load the INT8 variant (runs in a worker thread)"""
+        try:
+            model = load_quantized(model_path)
+            error = None
+        except Exception as e:
+            model, error = None, e
+        self.root.after(0, lambda: self.on_quantized_ready(model_path, model, error))
+    
+    def on_quantized_ready(self, model_path, model, error):
+        """Activate the INT8 model once it is ready"""
+        self.progress.stop()
+        self.int8_check.config(state=tk.NORMAL)
+        
+        if model_path != self.model_path:
+            return  # model was changed while quantizing
+        
+        if error:
+            self.int8_var.set(False)
+            messagebox.showerror("Error", f"Failed to create INT8 model:\n{str(error)}")
+            self.update_status("INT8 quantization failed", COLORS['error'])
+            return
+        
+        self.int8_model = model
+        self.toggle_quantized()
+    
+    def compare_quantized(self):
+        """Compare FP32 and INT8 variants over a folder of images"""
+        if not self.model_path:
+            messagebox.showwarning("Warning", "Please load a model first!")
+            return
+        
+        folder = filedialog.askdirectory(
+            title="Select Image Folder for Comparison",
+            initialdir="test_images" if Path("test_images").exists() else "."
+        )
+        
+        if not folder:
+            return
+        
+        self.progress.start()
+        self.update_status("Comparing FP32 and INT8 models...", COLORS['warning'])
+        threading.Thread(
+            target=self.run_quantized_comparison,
+            args=(self.model_path, folder, self.conf_var.get(), self.iou_var.get()),
+            daemon=True
+        ).start()
+    
+    def run_quantized_comparison(self, model_path, folder, conf, iou):
+        """Run the FP32/INT8 comparison (runs in a worker thread)"""
+        def progress(done, total):
+            self.root.after(0, lambda: self.update_status(
+                f"Comparing FP32 and INT8 models... {done}/{total}", COLORS['warning']))
+        
+        try:
+            report = compare_quantized(model_path, folder, conf, iou, progress=progress)
+            report_path = QUANT_CACHE_DIR / f"{Path(model_path).stem}-comparison.json"
+            report_path.write_text(json.dumps(report, indent=2))
+            error = None
+        except Exception as e:
+            report, report_path, error = None, None, e
+        self.root.after(0, lambda: self.on_comparison_done(report, report_path, error))
+    
+    def on_comparison_done(self, report, report_path, error):
+        """Show the FP32/INT8 comparison summary"""
+        self.progress.stop()
+        
+        if error:
+            messagebox.showerror("Error", f"Comparison failed:\n{str(error)}")
+            self.update_status("FP32/INT8 comparison failed", COLORS['error'])
+            return
+        
+        self.update_status(f"✓ Comparison complete: {report['images']} images", COLORS['success'])
+        messagebox.showinfo("FP32 vs INT8", f"{format_report(report)}\n\nFull report:\n{report_path}")
+    
     def upload_image(self):
         """Upload and display image"""
         if not self.model:
@@ -373,8 +680,13 @@ class YOLODetectorApp:
         if not file_path:
             return
         
+        self.select_image(file_path)
+    
+    def select_image(self, file_path):
+        """Make file_path the current image and display it"""
         self.current_file = file_path
         self.file_label.config(text=Path(file_path).name, style='Success.TLabel')
+        self.load_rois()
         
         # Display image
         self.display_image(file_path)
@@ -382,6 +694,100 @@ class YOLODetectorApp:
         self.detect_btn.config(state=tk.NORMAL)
         self.update_status(f"Image loaded: {Path(file_path).name}", COLORS['success'])
     
+    def open_folder(self):
+        """Browse a folder of images in the thumbnail gallery"""
+        if not self.model:
+            messagebox.showwarning("Warning", "Please load a model first!")
+            return
+        
+        folder = filedialog.askdirectory(
+            title="Select Image Folder",
+            initialdir="test_images" if Path("test_images").exists() else "."
+        )
+        
+        if not folder:
+            return
+        
+        if self.gallery is None:
+            self.gallery_frame = ttk.LabelFrame(self.content_frame, text="🗂️ Gallery", padding="10")
+            self.gallery_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 5), before=self.left_frame)
+            
+            self.predetect_var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(self.gallery_frame, text="⚡ Pre-detect neighbours", 
+                            variable=self.predetect_var).pack(anchor=tk.W, pady=(0, 5))
+            
+            self.gallery = ThumbnailGallery(
+                self.gallery_frame, self.on_gallery_select,
+                colors={'bg': COLORS['bg_light'], 'fg': COLORS['fg_dim'],
+                        'accent': COLORS['accent'], 'border': COLORS['border']}
+            )
+            self.gallery.pack(fill=tk.BOTH, expand=True)
+        
+        paths = self.gallery.load_folder(folder)
+        self.gallery_frame.config(text=f"🗂️ {Path(folder).name} ({len(paths)})")
+        self.update_status(f"Folder loaded: {len(paths)} images", COLORS['success'])
+    
+    def on_gallery_select(self, path, index):
+        """Select a gallery image; show it instantly if it was pre-detected"""
+        if self.is_processing:
+            return
+        
+        self.select_image(str(path))
+        if not self.rois and self.predetect_key(str(path)) in self.predetect_cache:
+            self.process_image()
+        
+        self.predetect(self.gallery.neighbours(index))
+    
+    def predetect_key(self, file_path):
+        """Cache key for a detection with the current model and thresholds"""
+        return (str(file_path), self.model_generation, round(self.conf_var.get(), 3), round(self.iou_var.get(), 3))
+    
+    def predetect(self, paths):
+        """Detect upcoming gallery images in the background"""
+        if not self.predetect_var.get() or self.model_b is not None or self.is_processing:
+            return
+        
+        if self.predetect_executor is None:
+            self.predetect_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='predetect')
+        
+        for path in paths:
+            if self.roi_store.get(str(path)):
+                continue  # ROI sources are detected on their crops, not pre-detected
+            key = self.predetect_key(str(path))
+            if key not in self.predetect_cache:
+                self.predetect_executor.submit(self.predetect_one, self.model, key)
+    
+    def predetect_one(self, model, key):
+        """Worker: run detection for one cache key"""
+        if key in self.predetect_cache or model is not self.model:
+            return
+        file_path, _, conf, iou = key
+        try:
+            with self.predict_lock:
+                detections = Detections.from_result(model.predict(file_path, conf=conf, iou=iou, verbose=False)[0])
+        except Exception:
+            return
+        if not self.closing:
+            self.root.after(0, lambda: self.store_predetection(key, detections))
+    
+    def on_close(self):
+        """Cancel queued thumbnail decodes and detections, then close the window"""
+        self.closing = True
+        self.stop_video = True
+        if self.gallery is not None:
+            self.gallery.close()
+        for executor in (self.predetect_executor, self.ab_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    def store_predetection(self, key, detections):
+        """Keep a frame's Detections (not the full result and its image) in the bounded LRU cache"""
+        self.predetect_cache[key] = detections
+        self.predetect_cache.move_to_end(key)
+        while len(self.predetect_cache) > PREDETECT_CACHE_SIZE:
+            self.predetect_cache.popitem(last=False)
+    
     def upload_video(self):
         """Upload video"""
         if not self.model:
@@ -390,7 +796,8 @@ class YOLODetectorApp:
         
         file_path = filedialog.askopenfilename(
             title="Select Video",
-            filetypes=[("Video files", "*.mp4 *.avi *.mov *.mkv"), ("All files", "*.*")]
+            filetypes=[("Video files", "*.mp4 *.avi *.mov *.mkv"), 
+                       ("Recorded sessions", "*.framelog"), ("All files", "*.*")]
         )
         
         if not file_path:
@@ -398,6 +805,15 @@ class YOLODetectorApp:
         
         self.current_file = file_path
         self.file_label.config(text=Path(file_path).name, style='Success.TLabel')
+        self.load_rois()
+        
+        # Show the first frame so ROIs can be drawn before detecting
+        preview = open_source(file_path, pacing='fast', prefetch=0)
+        ok, frame = preview.read()
+        preview.release()
+        if ok:
+            self.canvas.delete(self.canvas_text)
+            self.show_on_canvas(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
         
         self.detect_btn.config(state=tk.NORMAL)
         self.update_status(f"Video loaded: {Path(file_path).name}", COLORS['success'])
@@ -410,6 +826,7 @@ class YOLODetectorApp:
         
         self.current_file = 0  # Webcam index
         self.file_label.config(text="📹 Webcam", style='Success.TLabel')
+        self.load_rois()
         self.detect_btn.config(state=tk.NORMAL)
         self.update_status("Webcam selected", COLORS['success'])
     
@@ -419,31 +836,9 @@ class YOLODetectorApp:
             # Remove placeholder text
             self.canvas.delete(self.canvas_text)
             
-            # Load and resize image
-            img = Image.open(image_path)
-            
-            # Calculate resize to fit canvas
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-            
-            if canvas_width <= 1:
-                canvas_width = 800
-            if canvas_height <= 1:
-                canvas_height = 600
-            
-            img.thumbnail((canvas_width - 20, canvas_height - 20), Image.Resampling.LANCZOS)
-            
-            # Convert to PhotoImage
-            self.photo = ImageTk.PhotoImage(img)
-            
-            # Display on canvas
-            self.canvas.delete("all")
-            self.canvas.create_image(
-                canvas_width // 2, 
-                canvas_height // 2, 
-                image=self.photo, 
-                anchor=tk.CENTER
-            )
+            # Load image and fit it to the canvas
+            with Image.open(image_path) as img:
+                self.show_on_canvas(np.asarray(img.convert('RGB')))
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to display image:\n{str(e)}")
@@ -465,13 +860,17 @@ class YOLODetectorApp:
         )
         placeholder.pack(fill=tk.BOTH, expand=True)
     
-    def display_results(self, result, frame_num=None):
+    def display_results(self, detections, frame_num=None):
         """Display detection results in structured format"""
+        if self.bounded_var.get():
+            self.update_result_pool(detections, frame_num)
+            return
+        
         # Clear existing widgets
         for widget in self.result_frame.winfo_children():
             widget.destroy()
         
-        boxes = result.boxes
+        self.detection_data = detections
         
         # Header
         if frame_num:
@@ -494,7 +893,7 @@ class YOLODetectorApp:
         
         total_label = tk.Label(
             total_inner,
-            text=f"{len(boxes)}",
+            text=f"{len(detections)}",
             bg=COLORS['bg_lighter'],
             fg=COLORS['accent'],
             font=('Arial', 36, 'bold')
@@ -510,7 +909,7 @@ class YOLODetectorApp:
         )
         total_text.pack()
         
-        if len(boxes) == 0:
+        if len(detections) == 0:
             no_detect = tk.Label(
                 self.result_frame,
                 text="No objects detected",
@@ -535,15 +934,8 @@ class YOLODetectorApp:
         )
         summary_header.pack(fill=tk.X, pady=(5, 0))
         
-        # Count detections by class
-        class_counts = {}
-        for box in boxes:
-            cls_id = int(box.cls[0])
-            class_name = result.names[cls_id]
-            class_counts[class_name] = class_counts.get(class_name, 0) + 1
-        
         # Display summary cards
-        for class_name, count in sorted(class_counts.items(), key=lambda x: x[1], reverse=True):
+        for class_name, count in detections.summary():
             self.create_summary_card(class_name, count)
         
         # Separator
@@ -564,21 +956,214 @@ class YOLODetectorApp:
         detail_header.pack(fill=tk.X)
         
         # Display individual detections
-        for i, box in enumerate(boxes, 1):
-            cls_id = int(box.cls[0])
-            conf = float(box.conf[0])
-            class_name = result.names[cls_id]
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+        for i in range(len(detections)):
+            x1, y1, x2, y2 = detections.xyxy[i]
+            self.create_detection_card(i + 1, detections.class_name(detections.cls[i]),
+                                       float(detections.conf[i]), x1, y1, x2, y2)
+        
+        # Update scroll region
+        self.result_frame.update_idletasks()
+        self.result_canvas.configure(scrollregion=self.result_canvas.bbox("all"))
+    
+    def build_result_pool(self):
+        """Bounded mode: create the results panel once; cards are added lazily and then reused"""
+        pool = {'root': tk.Frame(self.result_frame, bg=COLORS['bg_light'])}
+        pool['root'].pack(fill=tk.X)
+        
+        header_section = tk.Frame(pool['root'], bg=COLORS['bg_light'])
+        header_section.pack(fill=tk.X)
+        pool['header'] = tk.Label(header_section, bg=COLORS['bg_lighter'], fg=COLORS['accent'],
+                                  font=('Arial', 12, 'bold'), pady=10)
+        
+        total_frame = tk.Frame(pool['root'], bg=COLORS['accent'], pady=2)
+        total_frame.pack(fill=tk.X, pady=(0, 10))
+        total_inner = tk.Frame(total_frame, bg=COLORS['bg_lighter'], pady=15)
+        total_inner.pack(fill=tk.BOTH, expand=True, padx=2)
+        pool['total'] = tk.Label(total_inner, bg=COLORS['bg_lighter'], fg=COLORS['accent'],
+                                 font=('Arial', 36, 'bold'))
+        pool['total'].pack()
+        tk.Label(total_inner, text="Objects Detected", bg=COLORS['bg_lighter'], fg=COLORS['fg_dim'],
+                 font=('Arial', 10)).pack()
+        
+        body = tk.Frame(pool['root'], bg=COLORS['bg_light'])
+        body.pack(fill=tk.X)
+        pool['empty'] = tk.Label(body, text="No objects detected", bg=COLORS['bg_light'],
+                                 fg=COLORS['fg_dim'], font=('Arial', 11), pady=20)
+        pool['details'] = tk.Frame(body, bg=COLORS['bg_light'])
+        
+        tk.Label(pool['details'], text="📈 Summary by Class", bg=COLORS['bg_light'], fg=COLORS['accent'],
+                 font=('Arial', 11, 'bold'), anchor=tk.W, pady=8, padx=10).pack(fill=tk.X, pady=(5, 0))
+        pool['summary_section'] = tk.Frame(pool['details'], bg=COLORS['bg_light'])
+        pool['summary_section'].pack(fill=tk.X)
+        tk.Frame(pool['details'], bg=COLORS['border'], height=2).pack(fill=tk.X, pady=15)
+        tk.Label(pool['details'], text="🔍 Detailed Detections", bg=COLORS['bg_light'], fg=COLORS['accent'],
+                 font=('Arial', 11, 'bold'), anchor=tk.W, pady=8, padx=10).pack(fill=tk.X)
+        pool['card_section'] = tk.Frame(pool['details'], bg=COLORS['bg_light'])
+        pool['card_section'].pack(fill=tk.X)
+        pool['more'] = tk.Label(pool['details'], bg=COLORS['bg_light'], fg=COLORS['fg_dim'],
+                                font=('Arial', 9), pady=8)
+        
+        pool['summary_cards'] = []
+        pool['detection_cards'] = []
+        return pool
+    
+    def update_result_pool(self, detections, frame_num=None):
+        """Bounded mode: refresh the pooled result widgets in place instead of rebuilding them"""
+        pool = self.result_pool
+        if pool is None or not pool['root'].winfo_exists():
+            # First use, or another view replaced the panel
+            for widget in self.result_frame.winfo_children():
+                widget.destroy()
+            pool = self.result_pool = self.build_result_pool()
+        
+        self.detection_data = detections
+        
+        def show(widget, visible, **pack_options):
+            if visible and not widget.winfo_manager():
+                widget.pack(**pack_options)
+            elif not visible and widget.winfo_manager():
+                widget.pack_forget()
+        
+        def fill(cards, count, create, update):
+            # Shown cards are always a prefix of the pool, so repacking keeps their order
+            for i in range(count):
+                if i < len(cards):
+                    update(cards[i], i)
+                    show(cards[i]['card'], True, **cards[i]['pack'])
+                else:
+                    cards.append(create(i))
+            for card in cards[count:]:
+                show(card['card'], False)
+        
+        pool['header'].config(text=f"FRAME {frame_num}")
+        show(pool['header'], bool(frame_num), fill=tk.X, pady=(0, 5))
+        pool['total'].config(text=f"{len(detections)}")
+        show(pool['empty'], len(detections) == 0)
+        show(pool['details'], len(detections) > 0, fill=tk.X)
+        
+        summary = detections.summary()
+        fill(pool['summary_cards'], len(summary),
+             lambda i: self.create_summary_card(*summary[i], parent=pool['summary_section']),
+             lambda card, i: self.update_summary_card(card, *summary[i]))
+        
+        def card_args(i):
+            x1, y1, x2, y2 = detections.xyxy[i]
+            return (i + 1, detections.class_name(detections.cls[i]), float(detections.conf[i]), x1, y1, x2, y2)
+        
+        shown = min(len(detections), BOUNDED_MAX_CARDS)
+        fill(pool['detection_cards'], shown,
+             lambda i: self.create_detection_card(*card_args(i), parent=pool['card_section']),
+             lambda card, i: self.update_detection_card(card, *card_args(i)))
+        pool['more'].config(text=f"… and {len(detections) - shown} more")
+        show(pool['more'], len(detections) > shown)
+        
+        self.result_frame.update_idletasks()
+        self.result_canvas.configure(scrollregion=self.result_canvas.bbox("all"))
+    
+    def display_ab_results(self, diff, frame_num=None):
+        """Display per-frame A/B differences"""
+        # Clear existing widgets
+        for widget in self.result_frame.winfo_children():
+            widget.destroy()
+        
+        # Header
+        header = tk.Label(
+            self.result_frame,
+            text=f"🆚 A/B - FRAME {frame_num}" if frame_num else "🆚 A/B Comparison",
+            bg=COLORS['bg_lighter'],
+            fg=COLORS['accent'],
+            font=('Arial', 12, 'bold'),
+            pady=10
+        )
+        header.pack(fill=tk.X, pady=(0, 5))
+        
+        # Side-by-side totals
+        totals_frame = tk.Frame(self.result_frame, bg=COLORS['bg_light'])
+        totals_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        for label, detections, ms, model_path in (("A", diff['a'], diff['ms_a'], diff['path_a']),
+                                                  ("B", diff['b'], diff['ms_b'], diff['path_b'])):
+            total_frame = tk.Frame(totals_frame, bg=COLORS['accent'], pady=2)
+            total_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+            
+            total_inner = tk.Frame(total_frame, bg=COLORS['bg_lighter'], pady=10)
+            total_inner.pack(fill=tk.BOTH, expand=True, padx=2)
+            
+            tk.Label(total_inner, text=f"{len(detections)}", bg=COLORS['bg_lighter'],
+                     fg=COLORS['accent'], font=('Arial', 24, 'bold')).pack()
+            tk.Label(total_inner, text=f"{label}: {Path(model_path).name}", bg=COLORS['bg_lighter'],
+                     fg=COLORS['fg'], font=('Arial', 9, 'bold')).pack()
+            tk.Label(total_inner, text=f"{ms:.1f} ms", bg=COLORS['bg_lighter'],
+                     fg=COLORS['fg_dim'], font=('Arial', 9)).pack()
+        
+        mean_iou = "n/a" if diff['mean_iou'] is None else f"{diff['mean_iou']:.2f}"
+        match_label = tk.Label(
+            self.result_frame,
+            text=f"Matched: {diff['matched']}  |  Mean IoU: {mean_iou}  |  "
+                 f"Missing in B: {len(diff['missing'])}  |  Extra in B: {len(diff['extra'])}",
+            bg=COLORS['bg_light'],
+            fg=COLORS['fg'],
+            font=('Arial', 9),
+            pady=5
+        )
+        match_label.pack(fill=tk.X)
+        
+        # Class counts A -> B
+        summary_header = tk.Label(
+            self.result_frame,
+            text="📈 Count by Class (A → B)",
+            bg=COLORS['bg_light'],
+            fg=COLORS['accent'],
+            font=('Arial', 11, 'bold'),
+            anchor=tk.W,
+            pady=8,
+            padx=10
+        )
+        summary_header.pack(fill=tk.X, pady=(5, 0))
+        
+        det_a, det_b = diff['a'], diff['b']
+        size = int(max(det_a.cls.max(initial=-1), det_b.cls.max(initial=-1))) + 1
+        counts_a = det_a.class_counts(size)
+        counts_b = det_b.class_counts(size)
+        for cls_id in np.argsort(np.maximum(counts_a, counts_b), kind='stable')[::-1]:
+            if counts_a[cls_id] == 0 and counts_b[cls_id] == 0:
+                break
+            self.create_summary_card(det_a.class_name(cls_id), f"{counts_a[cls_id]} → {counts_b[cls_id]}")
+        
+        # Unmatched detections
+        max_cards = BOUNDED_MAX_CARDS if self.bounded_var.get() else None
+        for title, detections, indices in (("❌ Missing in B", det_a, diff['missing']),
+                                           ("➕ Extra in B", det_b, diff['extra'])):
+            if not indices:
+                continue
+            
+            separator = tk.Frame(self.result_frame, bg=COLORS['border'], height=2)
+            separator.pack(fill=tk.X, pady=10)
+            
+            detail_header = tk.Label(
+                self.result_frame,
+                text=title,
+                bg=COLORS['bg_light'],
+                fg=COLORS['accent'],
+                font=('Arial', 11, 'bold'),
+                anchor=tk.W,
+                pady=8,
+                padx=10
+            )
+            detail_header.pack(fill=tk.X)
             
-            self.create_detection_card(i, class_name, conf, x1, y1, x2, y2)
+            for i in indices[:max_cards]:
+                x1, y1, x2, y2 = detections.xyxy[i]
+                self.create_detection_card(i + 1, detections.class_name(detections.cls[i]),
+                                           float(detections.conf[i]), x1, y1, x2, y2)
         
         # Update scroll region
         self.result_frame.update_idletasks()
         self.result_canvas.configure(scrollregion=self.result_canvas.bbox("all"))
     
-    def create_summary_card(self, class_name, count):
-        """Create a summary card for each class"""
-        card = tk.Frame(self.result_frame, bg=COLORS['bg_lighter'], pady=8, padx=10)
+    def create_summary_card(self, class_name, count, parent=None):
+        """Create a summary card for each class, returning its updatable widgets"""
+        card = tk.Frame(parent or self.result_frame, bg=COLORS['bg_lighter'], pady=8, padx=10)
         card.pack(fill=tk.X, pady=2, padx=5)
         
         # Class name
@@ -604,13 +1189,19 @@ class YOLODetectorApp:
             font=('Arial', 11, 'bold')
         )
         count_label.pack()
+        
+        return {'card': card, 'name': name_label, 'count': count_label, 'pack': dict(fill=tk.X, pady=2, padx=5)}
+    
+    def update_summary_card(self, widgets, class_name, count):
+        widgets['name'].config(text=class_name.capitalize())
+        widgets['count'].config(text=str(count))
 
-    def create_detection_card(self, index, class_name, conf, x1, y1, x2, y2):
-        """Create a detection card for individual detection"""
+    def create_detection_card(self, index, class_name, conf, x1, y1, x2, y2, parent=None):
+        """Create a detection card for individual detection, returning its updatable widgets"""
 
         # Main card
         card = tk.Frame(
-            self.result_frame,
+            parent or self.result_frame,
             bg=COLORS['bg_lighter'],
             highlightbackground=COLORS['border'],
             highlightthickness=1
@@ -623,7 +1214,6 @@ class YOLODetectorApp:
 
         index_label = tk.Label(
             header,
-            text=f"#{index}",
             bg=COLORS['bg_lighter'],
             fg=COLORS['accent'],
             font=('Arial', 9, 'bold'),
@@ -633,7 +1223,6 @@ class YOLODetectorApp:
 
         class_label = tk.Label(
             header,
-            text=class_name.capitalize(),
             bg=COLORS['bg_lighter'],
             fg=COLORS['fg'],
             font=('Arial', 10, 'bold'),
@@ -657,21 +1246,12 @@ class YOLODetectorApp:
         conf_bar_bg = tk.Frame(conf_frame, bg=COLORS['bg'], height=8)
         conf_bar_bg.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
 
-        conf_width = int(conf * 100)
-        conf_color = (
-            COLORS['success'] if conf > 0.7
-            else COLORS['warning'] if conf > 0.4
-            else COLORS['error']
-        )
-
-        conf_bar = tk.Frame(conf_bar_bg, bg=conf_color, width=conf_width, height=8)
+        conf_bar = tk.Frame(conf_bar_bg, height=8)
         conf_bar.pack(side=tk.LEFT)
 
         conf_percent = tk.Label(
             conf_frame,
-            text=f"{conf*100:.1f}%",
             bg=COLORS['bg_lighter'],
-            fg=conf_color,
             font=('Arial', 9, 'bold')
         )
         conf_percent.pack(side=tk.LEFT, padx=5)
@@ -682,12 +1262,29 @@ class YOLODetectorApp:
 
         bbox_label = tk.Label(
             bbox_frame,
-            text=f"Box: ({x1:.0f}, {y1:.0f}) → ({x2:.0f}, {y2:.0f})",
             bg=COLORS['bg_lighter'],
             fg=COLORS['fg_dim'],
             font=('Courier', 8)
         )
         bbox_label.pack(anchor=tk.W)
+        
+        widgets = {'card': card, 'index': index_label, 'class': class_label, 'bar': conf_bar,
+                   'percent': conf_percent, 'box': bbox_label, 'pack': dict(fill=tk.X, pady=3, padx=5)}
+        self.update_detection_card(widgets, index, class_name, conf, x1, y1, x2, y2)
+        return widgets
+    
+    def update_detection_card(self, widgets, index, class_name, conf, x1, y1, x2, y2):
+        """Fill a detection card's text, confidence bar and box"""
+        conf_color = (
+            COLORS['success'] if conf > 0.7
+            else COLORS['warning'] if conf > 0.4
+            else COLORS['error']
+        )
+        widgets['index'].config(text=f"#{index}")
+        widgets['class'].config(text=class_name.capitalize())
+        widgets['bar'].config(bg=conf_color, width=int(conf * 100))
+        widgets['percent'].config(text=f"{conf*100:.1f}%", fg=conf_color)
+        widgets['box'].config(text=f"Box: ({x1:.0f}, {y1:.0f}) → ({x2:.0f}, {y2:.0f})")
 
     def detect_objects(self):
         """Run object detection"""
@@ -706,7 +1303,7 @@ class YOLODetectorApp:
         self.stop_video = False
         
         # Check if image or video
-        if isinstance(self.current_file, int) or str(self.current_file).endswith(('.mp4', '.avi', '.mov', '.mkv')):
+        if isinstance(self.current_file, int) or str(self.current_file).lower().endswith(VIDEO_EXTENSIONS):
             # Video or webcam - run in thread
             self.video_thread = threading.Thread(target=self.process_video, daemon=True)
             self.video_thread.start()
@@ -720,49 +1317,103 @@ class YOLODetectorApp:
         try:
             self.update_status("Processing image...", COLORS['warning'])
             
-            # Run detection
-            results = self.model.predict(
-                self.current_file,
-                conf=self.conf_var.get(),
-                iou=self.iou_var.get(),
-                verbose=False
-            )
+            model_b = self.model_b
+            if model_b is not None:
+                # A/B mode - decode once, run both models on the same pixels
+                frame = cv2.imread(str(self.current_file))
+                if frame is None:
+                    raise ValueError(f"Could not read image: {self.current_file}")
+                
+                result, result_b, diff = self.infer_pair(frame, self.model, self.model_path,
+                                                         model_b, self.model_b_path)
+                annotated_rgb = self.render_pair(result, result_b, diff)
+                self.root.after(100, lambda: self.display_ab_results(diff))
+                
+                self.last_result = annotated_rgb
+                self.save_btn.config(state=tk.NORMAL)
+                self.update_status(
+                    f"✓ A/B complete: A {len(diff['a'])} ({diff['ms_a']:.0f} ms) | "
+                    f"B {len(diff['b'])} ({diff['ms_b']:.0f} ms) | {diff['matched']} matched",
+                    COLORS['success']
+                )
+                return
             
-            result = results[0]
+            # Near-duplicate of an image detected earlier? Reuse its detections
+            dedup_key = None
+            if self.dedup_var.get():
+                rois = list(self.rois)
+                if rois:
+                    # Hash the ROI crops, since only they are detected on
+                    frame = cv2.imread(str(self.current_file))
+                    if frame is None:
+                        raise ValueError(f"Could not read image: {self.current_file}")
+                    dedup_key, shape = dhash(frame, rois), frame.shape[:2]
+                else:
+                    dedup_key = dhash_file(self.current_file)
+                    with Image.open(self.current_file) as img:
+                        shape = (img.height, img.width)
+                detections = self.dedup_lookup(dedup_key, shape, rois)
+                if detections is not None:
+                    frame = cv2.imread(str(self.current_file))
+                    self.last_result = self.render_detections(frame, detections, rois)
+                    self.root.after(100, lambda: self.display_results(detections))
+                    
+                    self.save_btn.config(state=tk.NORMAL)
+                    self.update_status(f"✓ Near-duplicate: reused {len(detections)} detections | "
+                                       f"{self.dedup_status()}", COLORS['success'])
+                    return
             
-            # Get annotated image
-            annotated = result.plot()
-            annotated_rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
+            infer_start = time.perf_counter()
+            if self.rois:
+                # ROI mode - only the selected regions go through the model
+                frame = cv2.imread(str(self.current_file))
+                if frame is None:
+                    raise ValueError(f"Could not read image: {self.current_file}")
+                
+                rois = list(self.rois)
+                detections = self.infer_rois(frame, rois)
+                if dedup_key is not None:
+                    self.dedup.add(dedup_key, detections, (time.perf_counter() - infer_start) * 1000)
+                self.last_result = self.render_detections(frame, detections, rois)
+                self.root.after(100, lambda: self.display_results(detections))
+                
+                self.save_btn.config(state=tk.NORMAL)
+                self.update_status(f"✓ Detection complete: {len(detections)} objects found in "
+                                   f"{len(rois)} ROI(s)", COLORS['success'])
+                return
             
-            # Display result
-            img = Image.fromarray(annotated_rgb)
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
+            # Run detection, unless the gallery already pre-detected this image
+            key = self.predetect_key(self.current_file)
+            detections = self.predetect_cache.get(key)
             
-            if canvas_width <= 1:
-                canvas_width = 800
-            if canvas_height <= 1:
-                canvas_height = 600
+            inference_ms = None
+            if detections is None:
+                with self.predict_lock:
+                    results = self.model.predict(
+                        self.current_file,
+                        conf=self.conf_var.get(),
+                        iou=self.iou_var.get(),
+                        verbose=False
+                    )
+                inference_ms = (time.perf_counter() - infer_start) * 1000
                 
-            img.thumbnail((canvas_width - 20, canvas_height - 20), Image.Resampling.LANCZOS)
-            
-            self.photo = ImageTk.PhotoImage(img)
-            self.canvas.delete("all")
-            self.canvas.create_image(
-                canvas_width // 2,
-                canvas_height // 2,
-                image=self.photo,
-                anchor=tk.CENTER
-            )
+                result = results[0]
+                detections = Detections.from_result(result)
+                annotated_rgb = self.render_frame(result)
+            else:
+                annotated_rgb = self.render_detections(cv2.imread(str(self.current_file)), detections, None)
+            self.store_predetection(key, detections)
             
             # Display detection results - wrapped in after() to ensure canvas is ready
-            self.root.after(100, lambda: self.display_results(result))
+            if dedup_key is not None:
+                self.dedup.add(dedup_key, detections, inference_ms)
+            self.root.after(100, lambda: self.display_results(detections))
             
             # Save for later
             self.last_result = annotated_rgb
             self.save_btn.config(state=tk.NORMAL)
             
-            self.update_status(f"✓ Detection complete: {len(result.boxes)} objects found", COLORS['success'])
+            self.update_status(f"✓ Detection complete: {len(detections)} objects found", COLORS['success'])
             
         except Exception as e:
             import traceback
@@ -776,17 +1427,340 @@ class YOLODetectorApp:
             self.stop_btn.config(state=tk.DISABLED)
             self.is_processing = False
     
+    def dedup_lookup(self, key, shape, rois, max_reuse=None):
+        """Cached detections of a near-duplicate image/frame, or None to run the model"""
+        try:
+            self.dedup.threshold = self.dedup_threshold_var.get()
+        except tk.TclError:
+            pass
+        # Cached detections are only valid for the same model, thresholds and ROIs
+        self.dedup.use_context((self.model_generation, round(self.conf_var.get(), 3),
+                                round(self.iou_var.get(), 3), tuple(rois)))
+        return self.dedup.lookup(key, shape, max_reuse)
+    
+    def dedup_status(self):
+        stats = self.dedup.stats()
+        return (f"♻ {stats['inferences_saved']}/{stats['lookups']} inferences saved "
+                f"({stats['saved_percent']}%)")
+    
+    def infer_frame(self, frame, model=None):
+        """Run detection on one BGR frame (with the active model unless one is given)"""
+        with self.predict_lock:
+            results = (model or self.model).predict(
+                frame,
+                conf=self.conf_var.get(),
+                iou=self.iou_var.get(),
+                verbose=False
+            )
+        return results[0]
+    
+    def timed_predict(self, model, frame, conf, iou):
+        """Run one model on a frame, returning (result, milliseconds)"""
+        start = time.perf_counter()
+        result = model.predict(frame, conf=conf, iou=iou, verbose=False)[0]
+        return result, (time.perf_counter() - start) * 1000
+    
+    def infer_pair(self, frame, model_a, model_a_path, model_b, model_b_path):
+        """Run models A and B concurrently on the same decoded frame"""
+        conf = self.conf_var.get()
+        iou = self.iou_var.get()
+        
+        if self.ab_executor is None:
+            self.ab_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-b')
+        
+        # B runs on the worker while A runs here; inference releases the GIL.
+        # A's predictor is shared with pre-detection, so only A takes the lock.
+        future_b = self.ab_executor.submit(self.timed_predict, model_b, frame, conf, iou)
+        with self.predict_lock:
+            result_a, ms_a = self.timed_predict(model_a, frame, conf, iou)
+        result_b, ms_b = future_b.result()
+        
+        diff = self.diff_results(Detections.from_result(result_a), Detections.from_result(result_b))
+        diff['ms_a'] = ms_a
+        diff['ms_b'] = ms_b
+        diff['path_a'] = model_a_path
+        diff['path_b'] = model_b_path
+        return result_a, result_b, diff
+    
+    def diff_results(self, det_a, det_b):
+        """Match A and B boxes by IoU; unmatched A boxes are missing in B, unmatched B boxes are extra"""
+        matches, missing, extra = match_detections(det_a, det_b)
+        
+        return {
+            'a': det_a,
+            'b': det_b,
+            'matched': len(matches),
+            'mean_iou': float(np.mean([m[2] for m in matches])) if matches else None,
+            'missing': missing,
+            'extra': extra
+        }
+    
+    def render_pair(self, result_a, result_b, diff):
+        """Show A and B annotated frames side by side, returning the combined RGB array"""
+        views = []
+        for label, result, key in (("A", result_a, 'a'), ("B", result_b, 'b')):
+            annotated = result.plot()
+            text = f"{label}: {len(diff[key])} objects | {diff['ms_' + key]:.0f} ms"
+            cv2.putText(annotated, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 4)
+            cv2.putText(annotated, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+            views.append(annotated)
+        
+        divider = np.full((views[0].shape[0], 6, 3), 64, dtype=np.uint8)
+        combined_rgb = cv2.cvtColor(np.hstack((views[0], divider, views[1])), cv2.COLOR_BGR2RGB)
+        self.show_on_canvas(combined_rgb)
+        return combined_rgb
+    
+    def render_frame(self, result):
+        """Draw a result's annotated frame on the display canvas, returning the RGB array"""
+        annotated = result.plot()
+        annotated_rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
+        self.show_on_canvas(annotated_rgb)
+        return annotated_rgb
+    
+    def show_on_canvas(self, image_rgb):
+        """Fit an RGB array to the display canvas"""
+        img = Image.fromarray(image_rgb)
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        
+        if canvas_width <= 1:
+            canvas_width = 800
+        if canvas_height <= 1:
+            canvas_height = 600
+        
+        img.thumbnail((canvas_width - 20, canvas_height - 20), Image.Resampling.LANCZOS)
+        self.display_geometry = (canvas_width // 2 - img.width / 2, canvas_height // 2 - img.height / 2,
+                                 img.width, img.height)
+        
+        if self.bounded_var.get() and self.canvas.find_withtag('frame'):
+            # Bounded mode: paste into the existing Tk image and canvas item
+            if self.photo.width() == img.width and self.photo.height() == img.height:
+                self.photo.paste(img)
+            else:
+                self.photo = ImageTk.PhotoImage(img)
+                self.canvas.itemconfig('frame', image=self.photo)
+            self.canvas.coords('frame', canvas_width // 2, canvas_height // 2)
+        else:
+            self.photo = ImageTk.PhotoImage(img)
+            self.canvas.delete("all")
+            self.canvas.create_image(
+                canvas_width // 2,
+                canvas_height // 2,
+                image=self.photo,
+                anchor=tk.CENTER,
+                tags='frame'
+            )
+        
+        self.draw_roi_overlay()
+    
+    def load_rois(self):
+        """Load the saved ROIs of the current source"""
+        self.rois = self.roi_store.get(self.current_file) if self.current_file is not None else []
+        self.clear_roi_btn.config(state=tk.NORMAL if self.rois else tk.DISABLED)
+    
+    def clear_rois(self):
+        """Remove all ROIs of the current source"""
+        self.rois = []
+        if self.current_file is not None:
+            self.roi_store.set(self.current_file, self.rois)
+        self.clear_roi_btn.config(state=tk.DISABLED)
+        self.draw_roi_overlay()
+        self.update_status("ROIs cleared - detecting on the full frame", COLORS['fg_dim'])
+    
+    def draw_roi_overlay(self):
+        """Outline the ROIs on top of the displayed frame"""
+        self.canvas.delete('roi')
+        if not self.display_geometry or self.model_b is not None:
+            return
+        x0, y0, width, height = self.display_geometry
+        for x1, y1, x2, y2 in self.rois:
+            self.canvas.create_rectangle(
+                x0 + x1 * width, y0 + y1 * height, x0 + x2 * width, y0 + y2 * height,
+                outline=COLORS['warning'], width=2, tags='roi'
+            )
+    
+    def on_canvas_press(self, event):
+        """Start drawing an ROI"""
+        if not self.roi_edit_var.get() or self.current_file is None or not self.display_geometry:
+            return
+        if self.model_b is not None:
+            self.update_status("ROIs are not used in A/B mode", COLORS['warning'])
+            return
+        self.roi_drag = (event.x, event.y)
+        self.canvas.create_rectangle(event.x, event.y, event.x, event.y, outline=COLORS['warning'],
+                                     dash=(4, 2), width=2, tags='roi_drag')
+    
+    def on_canvas_drag(self, event):
+        if self.roi_drag:
+            self.canvas.coords('roi_drag', *self.roi_drag, event.x, event.y)
+    
+    def on_canvas_release(self, event):
+        """Finish an ROI and save it for the current source"""
+        if not self.roi_drag:
+            return
+        start, self.roi_drag = self.roi_drag, None
+        self.canvas.delete('roi_drag')
+        
+        # Canvas -> normalized frame coordinates
+        x0, y0, width, height = self.display_geometry
+        xs = sorted(min(max((x - x0) / width, 0.0), 1.0) for x in (start[0], event.x))
+        ys = sorted(min(max((y - y0) / height, 0.0), 1.0) for y in (start[1], event.y))
+        if (xs[1] - xs[0]) * width < 5 or (ys[1] - ys[0]) * height < 5:
+            return
+        
+        self.rois = self.rois + [(xs[0], ys[0], xs[1], ys[1])]
+        self.roi_store.set(self.current_file, self.rois)
+        self.clear_roi_btn.config(state=tk.NORMAL)
+        self.draw_roi_overlay()
+        self.update_status(f"ROI added - detecting in {len(self.rois)} region(s) only", COLORS['success'])
+    
+    def infer_rois(self, frame, rois, model=None):
+        """Run detection on the ROI crops of one BGR frame"""
+        with self.predict_lock:
+            return detect_rois(model or self.model, frame, rois, self.conf_var.get(), self.iou_var.get())
+    
+    def render_detections(self, frame, detections, rois):
+        """Draw ROI detections on the full frame, returning the RGB array"""
+        annotated_rgb = cv2.cvtColor(draw_detections(frame, detections, rois), cv2.COLOR_BGR2RGB)
+        self.show_on_canvas(annotated_rgb)
+        return annotated_rgb
+    
+    def open_video_source(self, source):
+        """Open a video file, webcam or frame log with the current range/sampling settings"""
+        max_size = self.max_size_var.get()
+        cap = open_source(
+            source,
+            pacing=PACING_OPTIONS[self.pacing_var.get()],
+            start=self.start_var.get(),
+            end=self.end_var.get(),
+            stride=self.stride_var.get(),
+            max_size=int(max_size) if max_size.isdigit() else None,
+            prefetch=VIDEO_PREFETCH_FRAMES
+        )
+        
+        # Record live sessions so they can be replayed frame-for-frame later
+        record_path = None
+        if isinstance(source, int) and self.record_var.get() and cap.isOpened():
+            record_path = RECORDINGS_DIR / time.strftime('webcam-%Y%m%d-%H%M%S.framelog')
+            cap = RecordingSource(cap, record_path)
+        return cap, record_path
+    
+    def start_video_session(self, fps):
+        """State for one video run; models and modes are fixed until it ends"""
+        # Both models are fixed for the whole run, even if they are changed meanwhile
+        ab_mode = self.model_b is not None
+        session = {
+            'frames': 0,
+            'detections': 0,
+            'model_a': self.model,
+            'model_a_path': self.model_path,
+            'model_b': self.model_b,
+            'model_b_path': self.model_b_path,
+            'ab_mode': ab_mode,
+            'ab_totals': dict.fromkeys(('ms_a', 'ms_b', 'ms_pair', 'matched', 'missing', 'extra'), 0),
+            # Near-duplicate skipping (not in A/B mode, which compares fresh runs)
+            'dedup': self.dedup_var.get() and not ab_mode
+        }
+        
+        # Streaming per-class analytics, timed on the source clock for files
+        self.analytics = StreamingClassStats(session['model_a'].names, ANALYTICS_WINDOW_SECONDS, fps or 30.0)
+        if session['dedup']:
+            self.dedup.reset_stats()
+        return session
+    
+    def process_frame(self, session, frame, timestamp, stage=None):
+        """
+        Detect, record and display one video frame. `stage(name, fn)` wraps
+        each step; the memory harness uses it to attribute growth.
+        """
+        stage = stage or (lambda name, fn: fn())
+        session['frames'] += 1
+        frame_count = session['frames']
+        ab_mode = session['ab_mode']
+        dedup = session['dedup']
+        
+        def detect():
+            rois = [] if ab_mode else list(self.rois)
+            detections = result = result_b = diff = dedup_key = None
+            if dedup:
+                # Bounded reuse, so objects appearing in a near-static scene are still picked up
+                dedup_key = dhash(frame, rois)
+                detections = self.dedup_lookup(dedup_key, frame.shape[:2], rois, MAX_FRAME_REUSE)
+            reused = detections is not None
+            
+            if ab_mode:
+                ab_totals = session['ab_totals']
+                pair_start = time.perf_counter()
+                result, result_b, diff = self.infer_pair(frame, session['model_a'], session['model_a_path'],
+                                                         session['model_b'], session['model_b_path'])
+                ab_totals['ms_pair'] += (time.perf_counter() - pair_start) * 1000
+                ab_totals['ms_a'] += diff['ms_a']
+                ab_totals['ms_b'] += diff['ms_b']
+                ab_totals['matched'] += diff['matched']
+                ab_totals['missing'] += len(diff['missing'])
+                ab_totals['extra'] += len(diff['extra'])
+                detections = diff['a']
+            elif not reused:
+                infer_start = time.perf_counter()
+                if rois:
+                    detections = self.infer_rois(frame, rois, session['model_a'])
+                else:
+                    result = self.infer_frame(frame, session['model_a'])
+                    detections = Detections.from_result(result)
+                if dedup:
+                    self.dedup.add(dedup_key, detections, (time.perf_counter() - infer_start) * 1000)
+            return detections, result, result_b, diff, rois, reused
+        
+        detections, result, result_b, diff, rois, reused = stage('inference', detect)
+        session['detections'] += len(detections)
+        
+        def update_analytics():
+            self.analytics.update(detections.cls, timestamp)
+            if frame_count % CHART_REFRESH_FRAMES == 0:
+                self.draw_analytics_chart()
+        
+        stage('analytics', update_analytics)
+        
+        # Display annotated frame and update results every 10 frames
+        if ab_mode:
+            def render():
+                self.render_pair(result, result_b, diff)
+                self.update_status(
+                    f"Frame {frame_count} - A: {len(diff['a'])} ({diff['ms_a']:.0f} ms) | "
+                    f"B: {len(diff['b'])} ({diff['ms_b']:.0f} ms)", COLORS['warning']
+                )
+            
+            stage('render', render)
+            if frame_count % 10 == 0:
+                stage('results', lambda: self.display_ab_results(diff, frame_count))
+        else:
+            def render():
+                if rois or reused:
+                    self.render_detections(frame, detections, rois)
+                else:
+                    self.render_frame(result)
+                self.update_status(f"Frame {frame_count} - {len(detections)} objects detected"
+                                   + (f" | {self.dedup_status()}" if dedup else ""), COLORS['warning'])
+            
+            stage('render', render)
+            if frame_count % 10 == 0:
+                stage('results', lambda: self.display_results(detections, frame_count))
+    
     def process_video(self):
         """Process video or webcam"""
+        cap = None
         try:
-            cap = cv2.VideoCapture(self.current_file)
+            try:
+                cap, record_path = self.open_video_source(self.current_file)
+            except tk.TclError:
+                messagebox.showerror("Error", "Video start, end and stride must be numbers!")
+                return
             
             if not cap.isOpened():
                 messagebox.showerror("Error", "Failed to open video source!")
                 return
             
-            frame_count = 0
-            total_detections = 0
+            session = self.start_video_session(cap.get(cv2.CAP_PROP_FPS))
             
             while cap.isOpened() and not self.stop_video:
                 ret, frame = cap.read()
@@ -794,68 +1768,112 @@ class YOLODetectorApp:
                 if not ret:
                     break
                 
-                frame_count += 1
-                
-                # Run detection
-                results = self.model.predict(
-                    frame,
-                    conf=self.conf_var.get(),
-                    iou=self.iou_var.get(),
-                    verbose=False
-                )
-                
-                result = results[0]
-                total_detections += len(result.boxes)
-                
-                # Get annotated frame
-                annotated = result.plot()
-                annotated_rgb = cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
-                
-                # Display frame
-                img = Image.fromarray(annotated_rgb)
-                canvas_width = self.canvas.winfo_width()
-                canvas_height = self.canvas.winfo_height()
-                img.thumbnail((canvas_width - 20, canvas_height - 20), Image.Resampling.LANCZOS)
-                
-                self.photo = ImageTk.PhotoImage(img)
-                self.canvas.delete("all")
-                self.canvas.create_image(
-                    canvas_width // 2,
-                    canvas_height // 2,
-                    image=self.photo,
-                    anchor=tk.CENTER
-                )
-                
-                # Update status
-                self.update_status(f"Frame {frame_count} - {len(result.boxes)} objects detected", COLORS['warning'])
-                
-                # Update results every 10 frames
-                if frame_count % 10 == 0:
-                    self.display_results(result, frame_count)
+                self.process_frame(session, frame, cap.timestamp)
                 
                 # Small delay for display
                 time.sleep(0.01)
             
             cap.release()
+            frame_count = session['frames']
+            ab_totals = session['ab_totals']
+            
+            if self.analytics.frames:
+                self.draw_analytics_chart()
+                self.export_btn.config(state=tk.NORMAL)
             
             if not self.stop_video:
-                self.update_status(f"✓ Video complete: {frame_count} frames, {total_detections} total detections", COLORS['success'])
+                self.update_status(f"✓ Video complete: {frame_count} frames, {session['detections']} total detections", COLORS['success'])
+                top_classes = "\n".join(
+                    f"  {c['class']}: {c['total']} (peak {c['peak']}, present {c['occupancy']*100:.0f}%)"
+                    for c in self.analytics.summary()['classes'][:5]
+                )
+                ab_summary = ""
+                if session['ab_mode'] and frame_count:
+                    ab_summary = (
+                        f"\n\nA/B: A {ab_totals['ms_a'] / frame_count:.1f} ms | "
+                        f"B {ab_totals['ms_b'] / frame_count:.1f} ms | "
+                        f"both {ab_totals['ms_pair'] / frame_count:.1f} ms per frame\n"
+                        f"Matched {ab_totals['matched']} | missing in B {ab_totals['missing']} | "
+                        f"extra in B {ab_totals['extra']}"
+                    )
+                dedup_summary = ""
+                if session['dedup']:
+                    stats = self.dedup.stats()
+                    dedup_summary = (
+                        f"\n\nNear-duplicates: {stats['inferences_saved']} of {stats['lookups']} inferences "
+                        f"saved ({stats['saved_percent']}%, ~{stats['est_time_saved_s']} s)"
+                    )
                 messagebox.showinfo("Complete", 
                                   f"Video processing complete!\n"
                                   f"Frames: {frame_count}\n"
-                                  f"Total detections: {total_detections}")
+                                  f"Total detections: {session['detections']}"
+                                  + (f"\n\nTop classes:\n{top_classes}" if top_classes else "")
+                                  + ab_summary + dedup_summary)
             else:
                 self.update_status("Video processing stopped", COLORS['warning'])
             
+            if record_path:
+                self.update_status(f"⏺ Session recorded: {record_path} ({frame_count} frames)", COLORS['success'])
+            
         except Exception as e:
             messagebox.showerror("Error", f"Video processing failed:\n{str(e)}")
             self.update_status("Video processing failed", COLORS['error'])
         
         finally:
+            if cap is not None:
+                cap.release()
             self.detect_btn.config(state=tk.NORMAL)
             self.stop_btn.config(state=tk.DISABLED)
             self.is_processing = False
     
+    def draw_analytics_chart(self):
+        """Draw rolling-window per-class counts as a time series"""
+        canvas = self.chart_canvas
+        canvas.delete("all")
+        
+        times, counts = self.analytics.window()
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if len(times) < 2 or width <= 1:
+            return
+        
+        pad = 8
+        t0 = times[-1] - self.analytics.window_seconds
+        x = pad + (times - t0) / self.analytics.window_seconds * (width - 2 * pad)
+        y_scale = (height - 2 * pad) / max(1, int(counts.max()))
+        
+        canvas.create_text(width - pad, pad, text=f"max {int(counts.max())} | last {self.analytics.window_seconds:.0f}s",
+                           anchor=tk.NE, fill=COLORS['fg_dim'], font=('Arial', 7))
+        
+        for i, cls_id in enumerate(self.analytics.top_classes(len(CHART_COLORS))):
+            y = height - pad - counts[:, cls_id] * y_scale
+            points = np.column_stack((x, y)).ravel().tolist()
+            canvas.create_line(*points, fill=CHART_COLORS[i], width=2)
+            canvas.create_text(pad, pad + i * 12, text=self.analytics.names.get(cls_id, str(cls_id)),
+                               anchor=tk.NW, fill=CHART_COLORS[i], font=('Arial', 7, 'bold'))
+    
+    def export_analytics(self):
+        """Export the per-class analytics summary of the last video run"""
+        if not self.analytics or not self.analytics.frames:
+            messagebox.showwarning("Warning", "No video analytics to export!")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="Export Analytics",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("CSV", "*.csv"), ("All files", "*.*")]
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            self.analytics.export(file_path)
+            messagebox.showinfo("Success", f"Analytics exported to:\n{file_path}")
+            self.update_status(f"✓ Analytics exported: {Path(file_path).name}", COLORS['success'])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export analytics:\n{str(e)}")
+    
     def stop_detection(self):
         """Stop video processing"""
         self.stop_video = True
@@ -895,8 +1913,11 @@ class YOLODetectorApp:
         )
         
         self.show_no_results()
+        self.chart_canvas.delete("all")
         
         self.current_file = None
+        self.display_geometry = None
+        self.load_rois()
         self.file_label.config(text="No file selected", style='Error.TLabel')
         self.detect_btn.config(state=tk.DISABLED)
         self.save_btn.config(state=tk.DISABLED)
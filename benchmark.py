@@ -0,0 +1,112 @@
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+
+from video_io import ReplaySource, SyntheticSource, open_source
+
+try:
+    from ultralytics import YOLO
+except ImportError:
+    print("ERROR: ultralytics not installed!")
+    print("Install with: pip install ultralytics")
+    exit(1)
+
+
+def summarize(values_ms):
+    """Mean / p50 / p95 of a list of milliseconds"""
+    if not values_ms:
+        return {'mean': 0.0, 'p50': 0.0, 'p95': 0.0}
+    ordered = sorted(values_ms)
+    return {
+        'mean': round(statistics.fmean(ordered), 2),
+        'p50': round(ordered[len(ordered) // 2], 2),
+        'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2)
+    }
+
+
+def run_pipeline(model, source, max_frames=None, conf=0.25, iou=0.45, render=True):
+    """Capture -> inference -> annotate, as the app's video path does, timing each stage"""
+    capture_ms, inference_ms, render_ms = [], [], []
+    detections = 0
+    frames = 0
+
+    start = time.perf_counter()
+    while max_frames is None or frames < max_frames:
+        t0 = time.perf_counter()
+        ok, frame = source.read()
+        if not ok:
+            break
+        t1 = time.perf_counter()
+        result = model.predict(frame, conf=conf, iou=iou, verbose=False)[0]
+        t2 = time.perf_counter()
+        if render:
+            cv2.cvtColor(result.plot(), cv2.COLOR_BGR2RGB)
+        t3 = time.perf_counter()
+
+        capture_ms.append((t1 - t0) * 1000)
+        inference_ms.append((t2 - t1) * 1000)
+        render_ms.append((t3 - t2) * 1000)
+        detections += len(result.boxes)
+        frames += 1
+    elapsed = time.perf_counter() - start
+    source.release()
+
+    return {
+        'frames': frames,
+        'detections': detections,
+        'elapsed_s': round(elapsed, 3),
+        'fps': round(frames / elapsed, 2) if elapsed else 0.0,
+        'capture_ms': summarize(capture_ms),
+        'inference_ms': summarize(inference_ms),
+        'render_ms': summarize(render_ms)
+    }
+
+
+def main():
+    """Measure pipeline throughput on a reproducible frame source"""
+    parser = argparse.ArgumentParser(description="Video pipeline throughput benchmark")
+    parser.add_argument('--model', required=True, help="Path to .pt model")
+    parser.add_argument('--source', default='synthetic',
+                        help="'synthetic', a recorded .framelog, or a video file")
+    parser.add_argument('--pacing', default='fast', help="'fast', 'realtime' or a speed such as 4x")
+    parser.add_argument('--frames', type=int, help="Stop after this many frames")
+    parser.add_argument('--loop', action='store_true', help="Loop a .framelog until --frames is reached")
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--iou', type=float, default=0.45)
+    parser.add_argument('--no-render', action='store_true', help="Skip annotation drawing")
+    parser.add_argument('--json', help="Write the report to this file")
+    args = parser.parse_args()
+
+    if args.source == 'synthetic':
+        source = SyntheticSource(args.frames or 500, pacing=args.pacing)
+    elif args.source.lower().endswith('.framelog'):
+        source = ReplaySource(args.source, pacing=args.pacing, loop=args.loop and args.frames is not None)
+    else:
+        source = open_source(args.source)
+    if not source.isOpened():
+        print(f"ERROR: cannot open source: {args.source}")
+        exit(1)
+
+    model = YOLO(args.model)
+    model.predict(SyntheticSource(1).read()[1], verbose=False)  # warm-up
+
+    report = run_pipeline(model, source, args.frames, args.conf, args.iou, render=not args.no_render)
+    report.update({'model': Path(args.model).name, 'source': args.source, 'pacing': args.pacing})
+
+    print(f"{report['frames']} frames in {report['elapsed_s']} s -> {report['fps']} FPS "
+          f"({report['detections']} detections)")
+    for stage in ('capture', 'inference', 'render'):
+        stats = report[f'{stage}_ms']
+        print(f"  {stage:<10} mean {stats['mean']:>8.2f} ms | p50 {stats['p50']:>8.2f} | p95 {stats['p95']:>8.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+from detections import Detections
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+
+def list_images(folder):
+    """Return image files in folder, sorted by name"""
+    return sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def box_iou(boxes_a, boxes_b):
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def match_boxes(boxes_a, cls_a, boxes_b, cls_b, iou_threshold=0.5):
+    """
+    Greedily match same-class boxes by descending IoU.
+    Returns (matches [(i, j, iou)], unmatched indices of a, unmatched indices of b).
+    """
+    iou = box_iou(boxes_a, boxes_b)
+    if iou.size:
+        iou[np.asarray(cls_a)[:, None] != np.asarray(cls_b)[None, :]] = 0
+
+    matches = []
+    used_a, used_b = set(), set()
+    for flat in np.argsort(iou, axis=None)[::-1]:
+        i, j = np.unravel_index(flat, iou.shape)
+        if iou[i, j] < iou_threshold:
+            break
+        if i in used_a or j in used_b:
+            continue
+        used_a.add(i)
+        used_b.add(j)
+        matches.append((int(i), int(j), float(iou[i, j])))
+
+    unmatched_a = [i for i in range(iou.shape[0]) if i not in used_a]
+    unmatched_b = [j for j in range(iou.shape[1]) if j not in used_b]
+    return matches, unmatched_a, unmatched_b
+
+
+def match_detections(det_a, det_b, iou_threshold=0.5):
+    """match_boxes() for two Detections"""
+    return match_boxes(det_a.xyxy, det_a.cls, det_b.xyxy, det_b.cls, iou_threshold)
+
+
+def compare_models(model_a, model_b, images, conf=0.25, iou=0.45, iou_threshold=0.5, progress=None):
+    """
+    Run both models over the same images and report latency and agreement.
+    Model A is the reference; `progress(done, total)` is called after each image.
+    """
+    images = list(images)
+    if not images:
+        raise ValueError("No images to compare")
+
+    # Warm up both models so the first image does not skew latency
+    for model in (model_a, model_b):
+        model.predict(str(images[0]), conf=conf, iou=iou, verbose=False)
+
+    latency_a, latency_b, per_image = [], [], []
+    matched_ious = []
+    total_a = total_b = total_matched = 0
+
+    for n, path in enumerate(images, 1):
+        start = time.perf_counter()
+        result_a = model_a.predict(str(path), conf=conf, iou=iou, verbose=False)[0]
+        latency_a.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        result_b = model_b.predict(str(path), conf=conf, iou=iou, verbose=False)[0]
+        latency_b.append((time.perf_counter() - start) * 1000)
+
+        det_a = Detections.from_result(result_a)
+        det_b = Detections.from_result(result_b)
+        matches, missing, extra = match_detections(det_a, det_b, iou_threshold)
+
+        matched_ious.extend(m[2] for m in matches)
+        total_a += len(det_a)
+        total_b += len(det_b)
+        total_matched += len(matches)
+        per_image.append({
+            'image': Path(path).name,
+            'count_a': len(det_a),
+            'count_b': len(det_b),
+            'matched': len(matches),
+            'missing': len(missing),
+            'extra': len(extra),
+            'mean_iou': round(statistics.fmean(m[2] for m in matches), 4) if matches else None
+        })
+
+        if progress:
+            progress(n, len(images))
+
+    count_deltas = [img['count_b'] - img['count_a'] for img in per_image]
+    return {
+        'images': len(images),
+        'iou_threshold': iou_threshold,
+        'latency_ms': {
+            'a_mean': round(statistics.fmean(latency_a), 2),
+            'b_mean': round(statistics.fmean(latency_b), 2),
+            'a_median': round(statistics.median(latency_a), 2),
+            'b_median': round(statistics.median(latency_b), 2),
+            'speedup': round(statistics.fmean(latency_a) / statistics.fmean(latency_b), 3)
+        },
+        'agreement': {
+            'detections_a': total_a,
+            'detections_b': total_b,
+            'matched': total_matched,
+            'f1': round(2 * total_matched / (total_a + total_b), 4) if total_a + total_b else 1.0,
+            'mean_matched_iou': round(statistics.fmean(matched_ious), 4) if matched_ious else None,
+            'mean_abs_count_delta': round(statistics.fmean(abs(d) for d in count_deltas), 3),
+            'images_with_count_change': sum(1 for d in count_deltas if d)
+        },
+        'per_image': per_image
+    }
@@ -0,0 +1,232 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from compare import list_images
+from detections import Detections
+from roi import roi_pixels
+
+try:
+    from ultralytics import YOLO
+except ImportError:
+    print("ERROR: ultralytics not installed!")
+    print("Install with: pip install ultralytics")
+    exit(1)
+
+HASH_SIZE = 8  # 8x8 gradient bits -> 64-bit hash
+DEFAULT_THRESHOLD = 4  # max Hamming distance counted as a near-duplicate
+MAX_CACHED_HASHES = 5000
+MAX_FRAME_REUSE = 15  # video: frames one cached entry may serve before a fresh inference
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _gradient_hash(gray):
+    """Difference hash of a (HASH_SIZE, HASH_SIZE + 1) grayscale array"""
+    bits = (gray[:, 1:] > gray[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def dhash(frame, rois=None):
+    """
+    64-bit difference hash of a BGR (or grayscale) frame. With ROIs, the
+    hashes of the ROI crops are concatenated instead (64 bits per ROI), so
+    a change inside a small region is not averaged away by the full frame.
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    boxes = roi_pixels(rois, gray.shape[1], gray.shape[0]) if rois else [(0, 0, gray.shape[1], gray.shape[0])]
+    key = 0
+    for x1, y1, x2, y2 in boxes:
+        crop = cv2.resize(gray[y1:y2, x1:x2], (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+        key = (key << HASH_SIZE * HASH_SIZE) | _gradient_hash(crop)
+    return key
+
+
+def dhash_file(path):
+    """Difference hash of an image file, decoded at reduced resolution"""
+    with Image.open(path) as img:
+        img.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))  # JPEG: decode at 1/2-1/8 scale
+        gray = img.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    return _gradient_hash(np.asarray(gray))
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over integer hashes with Hamming distance.
+    A radius query only descends into children whose edge distance is
+    within radius of the query's distance to the node.
+    """
+
+    def __init__(self):
+        self.root = None  # [hash, value, {distance: child}]
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, key, value):
+        node = [key, value, {}]
+        self.size += 1
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming(key, current[0])
+            if distance == 0:
+                current[1] = value  # same hash: keep the newest value
+                self.size -= 1
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, key, radius):
+        """[(distance, hash, value)] within radius, closest first"""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(key, node[0])
+            if distance <= radius:
+                found.append((distance, node[0], node[1]))
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return sorted(found, key=lambda item: item[0])
+
+
+class DedupCache:
+    """
+    Detections keyed by perceptual hash. A lookup within `threshold` bits
+    of a cached hash returns that entry's detections instead of a model run.
+    Entries are tied to a context (model, thresholds, ROIs); changing it
+    empties the cache. With `max_reuse`, an entry stops matching after
+    serving that many lookups, so slowly changing video gets re-detected.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_entries=MAX_CACHED_HASHES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.tree = BKTree()
+        self.context = None
+        self.lookups = 0
+        self.hits = 0
+        self.inference_ms_total = 0.0  # measured model runs, to estimate time saved
+        self.inferences_timed = 0
+
+    def use_context(self, context):
+        if context != self.context:
+            self.context = context
+            self.tree = BKTree()
+
+    def lookup(self, key, shape=None, max_reuse=None):
+        """Cached detections of the closest near-duplicate, rescaled to shape, or None"""
+        self.lookups += 1
+        matches = self.tree.search(key, self.threshold) if self.threshold >= 0 else []
+        # Entries are [detections, times reused]
+        entry = next((m[2] for m in matches if max_reuse is None or m[2][1] < max_reuse), None)
+        if entry is None:
+            return None
+        self.hits += 1
+        entry[1] += 1
+        return entry[0].rescale(shape) if shape else entry[0]
+
+    def add(self, key, detections, inference_ms=None):
+        if len(self.tree) >= self.max_entries:
+            self.tree = BKTree()  # BK-trees cannot evict cheaply; start over
+        self.tree.add(key, [detections, 0])
+        if inference_ms is not None:
+            self.inference_ms_total += inference_ms
+            self.inferences_timed += 1
+
+    def reset_stats(self):
+        self.lookups = self.hits = 0
+        self.inference_ms_total = 0.0
+        self.inferences_timed = 0
+
+    def stats(self):
+        mean_ms = self.inference_ms_total / self.inferences_timed if self.inferences_timed else 0.0
+        return {
+            'threshold': self.threshold,
+            'lookups': self.lookups,
+            'inferences_saved': self.hits,
+            'inferences_run': self.lookups - self.hits,
+            'saved_percent': round(100 * self.hits / self.lookups, 1) if self.lookups else 0.0,
+            'est_time_saved_s': round(self.hits * mean_ms / 1000, 2),
+            'cached_hashes': len(self.tree)
+        }
+
+
+def detect_folder(model, images, threshold=DEFAULT_THRESHOLD, conf=0.25, iou=0.45):
+    """Detect on every image, reusing detections for near-duplicates. Returns (per-image list, stats)"""
+    cache = DedupCache(threshold)
+    cache.use_context((conf, iou))
+    per_image = []
+    start = time.perf_counter()
+
+    for path in images:
+        key = dhash_file(path)
+        with Image.open(path) as img:
+            shape = (img.height, img.width)
+        detections = cache.lookup(key, shape)
+        reused = detections is not None
+        if not reused:
+            t0 = time.perf_counter()
+            detections = Detections.from_result(model.predict(str(path), conf=conf, iou=iou, verbose=False)[0])
+            cache.add(key, detections, (time.perf_counter() - t0) * 1000)
+        per_image.append({
+            'image': Path(path).name,
+            'hash': f"{key:016x}",
+            'reused': reused,
+            'count': len(detections)
+        })
+
+    stats = cache.stats()
+    stats['elapsed_s'] = round(time.perf_counter() - start, 3)
+    return per_image, stats
+
+
+def main():
+    """Bulk-detect a folder, skipping inference for near-duplicate images"""
+    parser = argparse.ArgumentParser(description="Near-duplicate aware folder detection")
+    parser.add_argument('--model', required=True, help="Path to .pt model")
+    parser.add_argument('--images', default='test_images', help="Folder of images")
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                        help="Max Hamming distance (of 64 bits) treated as a near-duplicate")
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--iou', type=float, default=0.45)
+    parser.add_argument('--json', help="Write the full report to this file")
+    args = parser.parse_args()
+
+    images = list_images(args.images)
+    if not images:
+        print(f"ERROR: no images in {args.images}")
+        exit(1)
+
+    model = YOLO(args.model)
+    per_image, stats = detect_folder(model, images, args.threshold, args.conf, args.iou)
+
+    for item in per_image:
+        if item['reused']:
+            print(f"  reused  {item['image']} ({item['count']} objects)")
+    print(f"{stats['lookups']} images: {stats['inferences_run']} inferences run, "
+          f"{stats['inferences_saved']} saved ({stats['saved_percent']}%, ~{stats['est_time_saved_s']} s) "
+          f"at threshold {stats['threshold']} in {stats['elapsed_s']} s")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'stats': stats, 'per_image': per_image}, indent=2))
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
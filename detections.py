@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class Detections:
+    """
+    Array-backed detections for one frame: parallel `xyxy` (N, 4) float32,
+    `conf` (N,) float32 and `cls` (N,) int64 arrays plus the model's class
+    names. Built once per frame with a single device-to-host copy, then
+    shared by the results panel, summaries, exports and caches.
+    """
+
+    __slots__ = ('xyxy', 'conf', 'cls', 'names', 'shape')
+
+    def __init__(self, xyxy, conf, cls, names, shape=None):
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32).reshape(-1)
+        self.cls = np.asarray(cls, dtype=np.int64).reshape(-1)
+        self.names = names
+        self.shape = shape  # (height, width) of the source frame
+
+    @classmethod
+    def from_result(cls, result):
+        """Build from an ultralytics result with one transfer of the boxes tensor"""
+        data = result.boxes.data.cpu().numpy()
+        # Columns: x1, y1, x2, y2, [track id,] conf, class
+        return cls(data[:, :4], data[:, -2], data[:, -1], result.names, tuple(result.orig_shape))
+
+    @classmethod
+    def empty(cls, names, shape=None):
+        return cls(np.zeros((0, 4)), np.zeros(0), np.zeros(0), names, shape)
+
+    @classmethod
+    def concat(cls, items, names, shape=None):
+        """Join several Detections (e.g. from image tiles) into one"""
+        items = list(items)
+        if not items:
+            return cls.empty(names, shape)
+        return cls(
+            np.concatenate([d.xyxy for d in items]),
+            np.concatenate([d.conf for d in items]),
+            np.concatenate([d.cls for d in items]),
+            names,
+            shape
+        )
+
+    def __len__(self):
+        return len(self.cls)
+
+    def __getitem__(self, index):
+        """Subset by slice, index array or boolean mask"""
+        return Detections(self.xyxy[index], self.conf[index], self.cls[index], self.names, self.shape)
+
+    def class_name(self, cls_id):
+        return self.names.get(int(cls_id), str(cls_id)) if isinstance(self.names, dict) else self.names[cls_id]
+
+    def class_counts(self, minlength=0):
+        """Detections per class id"""
+        return np.bincount(self.cls, minlength=minlength)
+
+    def summary(self):
+        """[(class name, count)] sorted by count, most frequent first"""
+        counts = self.class_counts()
+        order = np.argsort(counts, kind='stable')[::-1]
+        return [(self.class_name(i), int(counts[i])) for i in order if counts[i]]
+
+    def offset(self, dx, dy, shape=None):
+        """Shift boxes by (dx, dy), e.g. to map crop coordinates to the full frame"""
+        shift = np.array([dx, dy, dx, dy], dtype=np.float32)
+        return Detections(self.xyxy + shift, self.conf, self.cls, self.names, shape or self.shape)
+
+    def rescale(self, shape):
+        """Scale boxes to a frame of another (height, width), e.g. a resized near-duplicate"""
+        if self.shape is None or tuple(shape) == tuple(self.shape):
+            return self
+        sy, sx = shape[0] / self.shape[0], shape[1] / self.shape[1]
+        scale = np.array([sx, sy, sx, sy], dtype=np.float32)
+        return Detections(self.xyxy * scale, self.conf, self.cls, self.names, tuple(shape))
+
+    def to_dicts(self):
+        """One dict per detection with the fields shown on a detection card"""
+        xyxy = np.round(self.xyxy.astype(np.float64), 1).tolist()
+        conf = np.round(self.conf.astype(np.float64), 4).tolist()
+        return [
+            {'class': self.class_name(c), 'class_id': int(c), 'confidence': p, 'xyxy': box}
+            for c, p, box in zip(self.cls.tolist(), conf, xyxy)
+        ]
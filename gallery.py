@@ -0,0 +1,235 @@
+import hashlib
+import os
+import queue
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tkinter import ttk
+
+from PIL import Image, ImageTk
+
+from compare import list_images
+
+THUMB_CACHE_DIR = Path('.thumbnails')
+
+
+class ThumbnailCache:
+    """
+    On-disk JPEG thumbnail cache keyed by path, size and mtime.
+    Recency is kept in an in-memory LRU index (seeded from file mtimes) and
+    the oldest entries are evicted once `max_entries` or `max_bytes` is exceeded.
+    """
+
+    def __init__(self, cache_dir=THUMB_CACHE_DIR, max_entries=5000, max_bytes=200 * 1024 ** 2):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = OrderedDict()
+        self.total_bytes = 0
+
+        entries = [(f.stat().st_mtime, f.name, f.stat().st_size) for f in self.cache_dir.glob('*.jpg')]
+        for _, name, size in sorted(entries):
+            self.index[name] = size
+            self.total_bytes += size
+
+    def key(self, image_path, size):
+        image_path = Path(image_path).resolve()
+        stat = image_path.stat()
+        raw = f"{image_path}|{stat.st_mtime_ns}|{stat.st_size}|{size}"
+        return hashlib.sha1(raw.encode()).hexdigest() + '.jpg'
+
+    def get(self, image_path, size):
+        """Return the cached thumbnail, or None"""
+        name = self.key(image_path, size)
+        with self.lock:
+            if name not in self.index:
+                return None
+            self.index.move_to_end(name)
+        file_path = self.cache_dir / name
+        try:
+            os.utime(file_path)  # persist recency for the next session
+            with Image.open(file_path) as img:
+                return img.convert('RGB')
+        except OSError:
+            with self.lock:
+                self.total_bytes -= self.index.pop(name, 0)
+            return None
+
+    def put(self, image_path, size, thumbnail):
+        """Store a thumbnail and evict least recently used entries"""
+        name = self.key(image_path, size)
+        file_path = self.cache_dir / name
+        thumbnail.save(file_path, 'JPEG', quality=85)
+        file_size = file_path.stat().st_size
+
+        with self.lock:
+            self.total_bytes += file_size - self.index.pop(name, 0)
+            self.index[name] = file_size
+            while self.index and (len(self.index) > self.max_entries or self.total_bytes > self.max_bytes):
+                old_name, old_size = self.index.popitem(last=False)
+                self.total_bytes -= old_size
+                (self.cache_dir / old_name).unlink(missing_ok=True)
+
+
+def load_thumbnail(image_path, size):
+    """Decode an image at reduced resolution and shrink it to fit size x size"""
+    with Image.open(image_path) as img:
+        img.draft('RGB', (size, size))  # JPEG: decode directly at 1/2, 1/4 or 1/8 scale
+        img = img.convert('RGB')
+    img.thumbnail((size, size), Image.Resampling.BILINEAR)
+    return img
+
+
+class ThumbnailGallery(ttk.Frame):
+    """
+    Scrollable thumbnail grid for a folder of images.
+    Only cells in (or near) the visible area are decoded, on a background
+    thread pool; far-away thumbnails are released to keep memory flat.
+    """
+
+    def __init__(self, parent, on_select, cache=None, thumb_size=96, columns=3, workers=4, colors=None):
+        super().__init__(parent)
+        self.on_select = on_select
+        self.cache = cache or ThumbnailCache()
+        self.thumb_size = thumb_size
+        self.columns = columns
+        self.cell = thumb_size + 24
+        self.colors = colors or {'bg': '#2d2d2d', 'fg': '#b0b0b0', 'accent': '#007acc', 'border': '#404040'}
+
+        self.paths = []
+        self.selected = None
+        self.photos = {}
+        self.pending = set()
+        self.visible = range(0)
+        self.generation = 0
+        self.ready = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbs')
+
+        scroll = ttk.Scrollbar(self, command=self.yview)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(self, bg=self.colors['bg'], highlightthickness=0,
+                                width=columns * self.cell, yscrollcommand=scroll.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind('<Configure>', lambda e: self.load_visible())
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<MouseWheel>', lambda e: self.yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.yview('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.yview('scroll', 1, 'units'))
+
+        self.after(30, self.poll)
+
+    def load_folder(self, folder):
+        """Show all images in folder"""
+        self.generation += 1
+        self.paths = list_images(folder)
+        self.selected = None
+        self.photos.clear()
+        self.pending.clear()
+        self.canvas.delete("all")
+
+        for index, path in enumerate(self.paths):
+            x, y = self.cell_origin(index)
+            self.canvas.create_rectangle(x + 2, y + 2, x + self.cell - 2, y + self.cell - 2,
+                                         outline=self.colors['border'], tags=(f"frame{index}",))
+            self.canvas.create_text(x + self.cell // 2, y + self.cell - 10, text=self.short_name(path),
+                                    fill=self.colors['fg'], font=('Arial', 7))
+
+        rows = -(-len(self.paths) // self.columns)
+        self.canvas.configure(scrollregion=(0, 0, self.columns * self.cell, rows * self.cell))
+        self.canvas.yview_moveto(0)
+        self.load_visible()
+        return self.paths
+
+    def short_name(self, path):
+        name = path.name
+        return name if len(name) <= 16 else name[:13] + '...'
+
+    def cell_origin(self, index):
+        row, col = divmod(index, self.columns)
+        return col * self.cell, row * self.cell
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.load_visible()
+
+    def load_visible(self):
+        """Queue decoding for visible cells and release far-away thumbnails"""
+        if not self.paths:
+            return
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first = max(0, int(top // self.cell) - 1) * self.columns
+        last = min(len(self.paths), (int(bottom // self.cell) + 2) * self.columns)
+        self.visible = range(first, last)
+
+        for index in self.visible:
+            if index not in self.photos and index not in self.pending:
+                self.pending.add(index)
+                self.executor.submit(self.decode, self.generation, index, self.paths[index])
+
+        keep = range(first - 3 * len(self.visible), last + 3 * len(self.visible))
+        for index in [i for i in self.photos if i not in keep]:
+            self.canvas.delete(f"thumb{index}")
+            del self.photos[index]
+
+    def decode(self, generation, index, path):
+        """Worker: fetch from cache or decode a thumbnail"""
+        if generation != self.generation or index not in self.visible:
+            self.ready.put((generation, index, None))  # scrolled away before we got to it
+            return
+        try:
+            thumbnail = self.cache.get(path, self.thumb_size)
+            if thumbnail is None:
+                thumbnail = load_thumbnail(path, self.thumb_size)
+                self.cache.put(path, self.thumb_size, thumbnail)
+        except Exception:
+            thumbnail = None
+        self.ready.put((generation, index, thumbnail))
+
+    def poll(self):
+        """Main thread: turn decoded thumbnails into canvas images"""
+        try:
+            while True:
+                generation, index, thumbnail = self.ready.get_nowait()
+                if generation != self.generation:
+                    continue
+                self.pending.discard(index)
+                if thumbnail is None or index in self.photos:
+                    continue
+                photo = ImageTk.PhotoImage(thumbnail)
+                self.photos[index] = photo
+                x, y = self.cell_origin(index)
+                self.canvas.create_image(x + self.cell // 2, y + (self.cell - 14) // 2,
+                                         image=photo, tags=(f"thumb{index}",))
+        except queue.Empty:
+            pass
+        self.after(30, self.poll)
+
+    def on_click(self, event):
+        x = self.canvas.canvasx(event.x)
+        y = self.canvas.canvasy(event.y)
+        col, row = int(x // self.cell), int(y // self.cell)
+        index = row * self.columns + col
+        if col < self.columns and 0 <= index < len(self.paths):
+            self.select(index)
+
+    def select(self, index):
+        """Highlight a cell and notify the app"""
+        if self.selected is not None:
+            self.canvas.itemconfig(f"frame{self.selected}", outline=self.colors['border'], width=1)
+        self.selected = index
+        self.canvas.itemconfig(f"frame{index}", outline=self.colors['accent'], width=3)
+        self.on_select(self.paths[index], index)
+
+    def neighbours(self, index, ahead=2, behind=1):
+        """Paths around index, nearest first, in paging order"""
+        order = [index + i for i in range(1, ahead + 1)] + [index - i for i in range(1, behind + 1)]
+        return [self.paths[i] for i in order if 0 <= i < len(self.paths)]
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
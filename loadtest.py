@@ -0,0 +1,119 @@
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from compare import list_images
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def send_request(url, image_path, payload, mode):
+    """POST one image and return (latency seconds, ok flag)"""
+    if mode == 'path':
+        data = json.dumps({'path': str(image_path.resolve())}).encode('utf-8')
+        content_type = 'application/json'
+    else:
+        data = payload
+        content_type = 'application/octet-stream'
+
+    request = urllib.request.Request(
+        f"{url}/detect?name={urllib.request.quote(image_path.name)}",
+        data=data,
+        headers={'Content-Type': content_type},
+        method='POST'
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            ok = response.status == 200
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run(url, images, total, concurrency, mode):
+    """Fire `total` requests with `concurrency` workers and collect latencies"""
+    payloads = {p: p.read_bytes() for p in images} if mode == 'upload' else {}
+    jobs = [images[i % len(images)] for i in range(total)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda p: send_request(url, p, payloads.get(p), mode), jobs))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency * 1000 for latency, ok in outcomes if ok)
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'errors': sum(1 for _, ok in outcomes if not ok),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            'p50': round(percentile(latencies, 50), 2),
+            'p90': round(percentile(latencies, 90), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        }
+    }
+
+
+def main():
+    """Load-test a running server.py instance"""
+    parser = argparse.ArgumentParser(description="Load test for the local YOLO inference server")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--images', default='test_images', help="Folder of images to send")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--mode', choices=('upload', 'path'), default='upload',
+                        help="Send image bytes or a local path")
+    parser.add_argument('--json', help="Write the report to this file")
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/')
+    images = list_images(args.images)
+    if not images:
+        print(f"ERROR: no images found in {args.images}")
+        exit(1)
+
+    health = get_json(f"{url}/health")
+    print(f"Model: {health['model']} | {len(images)} images | mode: {args.mode}")
+    print(f"{'conc':>5} {'req/s':>8} {'mean':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'errors':>7} {'batch':>6}")
+
+    reports = []
+    for concurrency in args.concurrency:
+        before = get_json(f"{url}/stats")
+        report = run(url, images, args.requests, concurrency, args.mode)
+        after = get_json(f"{url}/stats")
+
+        batches = after['batches'] - before['batches']
+        report['avg_batch_size'] = round((after['images'] - before['images']) / batches, 2) if batches else 0.0
+        reports.append(report)
+
+        lat = report['latency_ms']
+        print(f"{concurrency:>5} {report['throughput_rps']:>8.2f} {lat['mean']:>8.1f} {lat['p50']:>8.1f} "
+              f"{lat['p90']:>8.1f} {lat['p99']:>8.1f} {report['errors']:>7} {report['avg_batch_size']:>6.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'model': health['model'], 'runs': reports}, indent=2))
+        print(f"Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import argparse
+import gc
+import json
+import time
+import tkinter as tk
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import psutil
+
+from app import YOLODetectorApp
+from video_io import ReplaySource, SyntheticSource
+
+SUBSYSTEMS = ('capture', 'inference', 'analytics', 'render', 'results')
+
+
+class StageMeter:
+    """Accumulates traced-heap and RSS deltas around each pipeline stage"""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.traced = dict.fromkeys(SUBSYSTEMS, 0)
+        self.rss = dict.fromkeys(SUBSYSTEMS, 0)
+        self.seconds = dict.fromkeys(SUBSYSTEMS, 0.0)
+
+    def run(self, name, fn):
+        traced_before = tracemalloc.get_traced_memory()[0]
+        rss_before = self.process.memory_info().rss
+        start = time.perf_counter()
+        value = fn()
+        self.seconds[name] += time.perf_counter() - start
+        self.rss[name] += self.process.memory_info().rss - rss_before
+        self.traced[name] += tracemalloc.get_traced_memory()[0] - traced_before
+        return value
+
+
+def run_harness(app, source, max_frames, warmup=100, report_every=1000, top=10):
+    """
+    Feed `source` through the app's own per-frame video path (process_frame:
+    detection with ROIs/dedup/A-B, analytics, chart, render, results panel)
+    and measure memory growth over max_frames.
+    """
+    process = psutil.Process()
+    session = app.start_video_session(source.get(cv2.CAP_PROP_FPS))
+
+    def step(meter=None):
+        stage = meter.run if meter else (lambda name, fn: fn())
+        ok, frame = stage('capture', source.read)
+        if not ok:
+            return False
+        app.process_frame(session, frame, source.timestamp, stage)
+        stage('render', app.root.update)  # pending Tk redraws
+        return True
+
+    # Let caches, allocator pools and Tk settle before measuring
+    for _ in range(warmup):
+        if not step():
+            break
+
+    gc.collect()
+    tracemalloc.start(25)
+    meter = StageMeter()
+    baseline = tracemalloc.take_snapshot()
+    rss_start = process.memory_info().rss
+    checkpoints = []
+
+    frames = 0
+    start = time.perf_counter()
+    while frames < max_frames and step(meter):
+        frames += 1
+        if frames % report_every == 0:
+            rss = process.memory_info().rss
+            checkpoints.append({'frames': frames, 'rss_mb': round(rss / 1024 ** 2, 1)})
+            print(f"  {frames:>7} frames | RSS {rss / 1024 ** 2:8.1f} MB "
+                  f"(+{(rss - rss_start) / 1024:.0f} KB) | traced {tracemalloc.get_traced_memory()[0] / 1024:.0f} KB")
+    elapsed = time.perf_counter() - start
+    source.release()
+
+    gc.collect()
+    top_growth = tracemalloc.take_snapshot().compare_to(baseline, 'lineno')[:top]
+    rss_end = process.memory_info().rss
+    tracemalloc.stop()
+
+    per_k = 1000 / frames if frames else 0
+    return {
+        'frames': frames,
+        'fps': round(frames / elapsed, 2) if elapsed else 0.0,
+        'bounded': app.bounded_var.get(),
+        'rois': len(app.rois),
+        'dedup': session['dedup'],
+        'rss_start_mb': round(rss_start / 1024 ** 2, 1),
+        'rss_end_mb': round(rss_end / 1024 ** 2, 1),
+        'rss_growth_kb_per_1k_frames': round((rss_end - rss_start) / 1024 * per_k, 1),
+        'subsystems': {
+            name: {
+                'traced_kb': round(meter.traced[name] / 1024, 1),
+                'rss_kb': round(meter.rss[name] / 1024, 1),
+                'traced_kb_per_1k_frames': round(meter.traced[name] / 1024 * per_k, 2),
+                'ms_per_frame': round(meter.seconds[name] * 1000 / frames, 2) if frames else 0.0
+            }
+            for name in SUBSYSTEMS
+        },
+        'top_growth': [
+            {'site': str(stat.traceback[0]), 'size_kb': round(stat.size_diff / 1024, 1), 'count': stat.count_diff}
+            for stat in top_growth
+        ],
+        'checkpoints': checkpoints
+    }
+
+
+def main():
+    """Run the video path against a synthetic or replayed source and report memory growth"""
+    parser = argparse.ArgumentParser(description="Memory growth harness for long video sessions")
+    parser.add_argument('--model', required=True, help="Path to .pt model")
+    parser.add_argument('--frames', type=int, default=5000)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--source', help="A .framelog (replayed in a loop), a video file or a webcam index, "
+                                         "read like the app does; default: synthetic frames")
+    parser.add_argument('--unbounded', action='store_true', help="Measure without bounded-memory mode")
+    parser.add_argument('--dedup', action='store_true', help="Enable near-duplicate skipping")
+    parser.add_argument('--roi', action='append', default=[], metavar='X1,Y1,X2,Y2',
+                        help="Detect only in this normalized region (repeatable)")
+    parser.add_argument('--report-every', type=int, default=1000)
+    parser.add_argument('--json', help="Write the report to this file")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.withdraw()
+    app = YOLODetectorApp(root, model_path=args.model)
+    if not app.model:
+        print(f"ERROR: failed to load model: {args.model}")
+        exit(1)
+    app.bounded_var.set(not args.unbounded)
+    app.dedup_var.set(args.dedup)
+    app.rois = [tuple(float(v) for v in roi.split(',')) for roi in args.roi]
+    root.deiconify()
+    root.update()
+
+    if not args.source:
+        source = SyntheticSource(args.frames + args.warmup, args.width, args.height)
+    elif args.source.lower().endswith('.framelog'):
+        source = ReplaySource(args.source, pacing='fast', loop=True)
+    else:
+        # Same reader (prefetch thread, sampling options) as the app's video path
+        source, _ = app.open_video_source(int(args.source) if args.source.isdigit() else args.source)
+    if not source.isOpened():
+        print(f"ERROR: cannot open source: {args.source}")
+        exit(1)
+    print(f"Running {args.frames} frames ({'unbounded' if args.unbounded else 'bounded'} mode)...")
+    report = run_harness(app, source, args.frames, warmup=args.warmup, report_every=args.report_every)
+    root.destroy()
+
+    print(f"\n{report['frames']} frames at {report['fps']} FPS | RSS {report['rss_start_mb']} -> "
+          f"{report['rss_end_mb']} MB ({report['rss_growth_kb_per_1k_frames']} KB / 1k frames)")
+    print(f"{'subsystem':<10} {'traced KB':>10} {'KB/1k':>8} {'RSS KB':>10} {'ms/frame':>9}")
+    for name, stats in report['subsystems'].items():
+        print(f"{name:<10} {stats['traced_kb']:>10.1f} {stats['traced_kb_per_1k_frames']:>8.2f} "
+              f"{stats['rss_kb']:>10.1f} {stats['ms_per_frame']:>9.2f}")
+    print("\nTop traced growth:")
+    for entry in report['top_growth']:
+        print(f"  {entry['size_kb']:>8.1f} KB {entry['count']:>+7}  {entry['site']}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from compare import compare_models, list_images
+
+try:
+    from ultralytics import YOLO
+except ImportError:
+    print("ERROR: ultralytics not installed!")
+    print("Install with: pip install ultralytics")
+    exit(1)
+
+QUANT_CACHE_DIR = Path('models') / '.quantized'
+
+# Run in a fresh interpreter per variant. Both runtimes are imported before the
+# baseline, so neither variant is charged for library imports the other skipped.
+MEASURE_LOAD_SCRIPT = """
+import gc, json, sys
+import psutil
+try:
+    import onnxruntime
+except ImportError:
+    pass
+from ultralytics import YOLO
+
+gc.collect()
+process = psutil.Process()
+before = process.memory_info().rss
+model = YOLO(sys.argv[1], task='detect')
+model.predict(sys.argv[2], verbose=False)
+after = process.memory_info().rss
+print(json.dumps({'rss_growth': (after - before) / 1024 ** 2, 'rss_total': after / 1024 ** 2}))
+"""
+
+
+def quantized_path(weights_path, cache_dir=QUANT_CACHE_DIR):
+    """Cache location of the INT8 variant, keyed by weights path, size and mtime"""
+    weights_path = Path(weights_path).resolve()
+    stat = weights_path.stat()
+    key = hashlib.sha1(f"{weights_path}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()[:12]
+    return Path(cache_dir) / f"{weights_path.stem}-{key}.int8.onnx"
+
+
+def quantize_model(weights_path, imgsz=640, cache_dir=QUANT_CACHE_DIR):
+    """
+    Create (or reuse) a dynamically quantized INT8 variant of a .pt model.
+
+    The weights are exported to ONNX and quantized with ONNX Runtime, which
+    covers the convolution layers that make up YOLO (torch's dynamic
+    quantization only handles Linear/LSTM layers). Returns the cached path.
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError:
+        raise RuntimeError("INT8 mode requires onnx and onnxruntime.\n"
+                           "Install with: pip install onnx onnxruntime")
+
+    target = quantized_path(weights_path, cache_dir)
+    if target.exists():
+        return target
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    # Export from a copy so an existing <model>.onnx next to the weights is never overwritten
+    with tempfile.TemporaryDirectory() as tmp:
+        weights_copy = Path(tmp) / Path(weights_path).name
+        shutil.copy2(weights_path, weights_copy)
+        fp32_onnx = YOLO(str(weights_copy)).export(
+            format='onnx', imgsz=imgsz, dynamic=True, simplify=True, verbose=False
+        )
+        partial = target.with_suffix('.tmp')
+        quantize_dynamic(str(fp32_onnx), str(partial), weight_type=QuantType.QUInt8)
+        partial.replace(target)
+
+    return target
+
+
+def load_quantized(weights_path, cache_dir=QUANT_CACHE_DIR):
+    """Load the INT8 variant of a .pt model, creating it if needed"""
+    return YOLO(str(quantize_model(weights_path, cache_dir=cache_dir)), task='detect')
+
+
+def measure_load(model_path, warmup_image):
+    """
+    Memory cost of loading a model and running one prediction, measured in
+    a fresh subprocess. Returns {'rss_growth', 'rss_total'} in MB.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-c', MEASURE_LOAD_SCRIPT, str(model_path), str(warmup_image)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare_quantized(weights_path, folder, conf=0.25, iou=0.45, iou_threshold=0.5, progress=None):
+    """
+    Compare the FP32 model with its INT8 variant over a folder of images.
+    Reports latency, memory footprint and detection agreement.
+    """
+    images = list_images(folder)
+    if not images:
+        raise ValueError(f"No images found in {folder}")
+
+    int8_path = quantize_model(weights_path)
+    fp32_memory = measure_load(weights_path, images[0])
+    int8_memory = measure_load(int8_path, images[0])
+    fp32_model = YOLO(str(weights_path))
+    int8_model = YOLO(str(int8_path), task='detect')
+
+    report = compare_models(fp32_model, int8_model, images, conf, iou, iou_threshold, progress)
+    report['model'] = Path(weights_path).name
+    report['int8_path'] = str(int8_path)
+    report['memory_mb'] = {
+        'fp32_file': round(Path(weights_path).stat().st_size / 1024 ** 2, 2),
+        'int8_file': round(int8_path.stat().st_size / 1024 ** 2, 2),
+        'fp32_rss_growth': round(fp32_memory['rss_growth'], 1),
+        'int8_rss_growth': round(int8_memory['rss_growth'], 1),
+        'fp32_rss_total': round(fp32_memory['rss_total'], 1),
+        'int8_rss_total': round(int8_memory['rss_total'], 1)
+    }
+    return report
+
+
+def format_report(report):
+    """Short human-readable summary of a compare_quantized() report"""
+    lat = report['latency_ms']
+    mem = report['memory_mb']
+    agree = report['agreement']
+    mean_iou = agree['mean_matched_iou']
+    return (
+        f"Images: {report['images']}\n\n"
+        f"Latency FP32: {lat['a_mean']:.1f} ms | INT8: {lat['b_mean']:.1f} ms "
+        f"(x{lat['speedup']:.2f})\n"
+        f"File size FP32: {mem['fp32_file']:.1f} MB | INT8: {mem['int8_file']:.1f} MB\n"
+        f"Load + first predict RSS growth FP32: {mem['fp32_rss_growth']:.0f} MB | "
+        f"INT8: {mem['int8_rss_growth']:.0f} MB (separate processes)\n\n"
+        f"Detections FP32: {agree['detections_a']} | INT8: {agree['detections_b']} | "
+        f"matched: {agree['matched']}\n"
+        f"Agreement F1: {agree['f1']:.3f} | mean matched IoU: "
+        f"{'n/a' if mean_iou is None else f'{mean_iou:.3f}'}\n"
+        f"Mean |count delta|: {agree['mean_abs_count_delta']:.2f} "
+        f"({agree['images_with_count_change']} images changed)"
+    )
+
+
+def main():
+    """Quantize a checkpoint and compare it against FP32 from the command line"""
+    parser = argparse.ArgumentParser(description="INT8 quantization speed/accuracy report")
+    parser.add_argument('--model', required=True, help="Path to .pt model")
+    parser.add_argument('--images', default='test_images', help="Folder of images to compare on")
+    parser.add_argument('--conf', type=float, default=0.25)
+    parser.add_argument('--iou', type=float, default=0.45)
+    parser.add_argument('--match-iou', type=float, default=0.5, help="IoU needed to match two boxes")
+    parser.add_argument('--json', help="Write the full report to this file")
+    args = parser.parse_args()
+
+    report = compare_quantized(args.model, args.images, args.conf, args.iou, args.match_iou)
+    print(format_report(report))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import torch
+from torchvision.ops import batched_nms
+from ultralytics.utils.plotting import Annotator, colors
+
+from detections import Detections
+
+ROI_FILE = Path('rois.json')
+MIN_ROI_PIXELS = 16
+MODEL_STRIDE = 32
+
+
+class RoiStore:
+    """
+    Regions of interest per source, saved to a JSON file.
+    ROIs are stored normalized to 0-1 so they survive resolution changes.
+    """
+
+    def __init__(self, path=ROI_FILE):
+        self.path = Path(path)
+        self.rois = {}
+        if self.path.exists():
+            try:
+                self.rois = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                self.rois = {}
+
+    @staticmethod
+    def source_key(source):
+        if isinstance(source, int):
+            return f"webcam:{source}"
+        return str(Path(source).resolve())
+
+    def get(self, source):
+        return [tuple(roi) for roi in self.rois.get(self.source_key(source), [])]
+
+    def set(self, source, rois):
+        key = self.source_key(source)
+        if rois:
+            self.rois[key] = [list(map(float, roi)) for roi in rois]
+        else:
+            self.rois.pop(key, None)
+        self.path.write_text(json.dumps(self.rois, indent=2))
+
+
+def roi_pixels(rois, width, height):
+    """Convert normalized ROIs to clipped integer pixel boxes, dropping tiny ones"""
+    boxes = []
+    for x1, y1, x2, y2 in rois:
+        box = (
+            int(np.clip(x1, 0, 1) * width), int(np.clip(y1, 0, 1) * height),
+            int(math.ceil(np.clip(x2, 0, 1) * width)), int(math.ceil(np.clip(y2, 0, 1) * height))
+        )
+        if box[2] - box[0] >= MIN_ROI_PIXELS and box[3] - box[1] >= MIN_ROI_PIXELS:
+            boxes.append(box)
+    return boxes
+
+
+def detect_rois(model, frame, rois, conf=0.25, iou=0.45, imgsz=640):
+    """
+    Run the model on the ROI crops only, as one batch, and map the boxes
+    back to full-frame coordinates. Class-aware NMS at `iou` then removes
+    duplicates of objects seen by several overlapping ROIs.
+
+    The network input is sized so crops keep the pixel scale a full-frame
+    pass would use (full frame -> imgsz), so a smaller region means a
+    proportionally smaller input rather than an upscaled crop.
+    """
+    height, width = frame.shape[:2]
+    boxes = roi_pixels(rois, width, height)
+    if not boxes:
+        return Detections.empty(model.names, (height, width))
+
+    crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes]
+    scale = imgsz / max(width, height)
+    largest = max(max(crop.shape[:2]) for crop in crops)
+    crop_size = min(imgsz, max(MODEL_STRIDE, math.ceil(largest * scale / MODEL_STRIDE) * MODEL_STRIDE))
+
+    results = model.predict(crops, conf=conf, iou=iou, imgsz=crop_size, verbose=False)
+    detections = Detections.concat(
+        (Detections.from_result(result).offset(x1, y1) for result, (x1, y1, _, _) in zip(results, boxes)),
+        model.names,
+        (height, width)
+    )
+    if len(boxes) < 2 or len(detections) < 2:
+        return detections
+
+    keep = batched_nms(
+        torch.from_numpy(detections.xyxy), torch.from_numpy(detections.conf),
+        torch.from_numpy(detections.cls), iou
+    )
+    return detections[np.sort(keep.numpy())]
+
+
+def draw_detections(frame, detections, rois=None):
+    """Annotate a BGR frame in the style of result.plot(), dimming everything outside the ROIs"""
+    if rois:
+        annotated = (frame * 0.4).astype(np.uint8)
+        for x1, y1, x2, y2 in roi_pixels(rois, frame.shape[1], frame.shape[0]):
+            annotated[y1:y2, x1:x2] = frame[y1:y2, x1:x2]
+    else:
+        annotated = frame.copy()
+
+    annotator = Annotator(annotated)
+    for box, conf, cls_id in zip(detections.xyxy, detections.conf, detections.cls):
+        annotator.box_label(box, f"{detections.class_name(cls_id)} {conf:.2f}", color=colors(int(cls_id), True))
+    return annotator.result()
@@ -0,0 +1,316 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+import numpy as np
+
+from detections import Detections
+
+try:
+    from ultralytics import YOLO
+except ImportError:
+    print("ERROR: ultralytics not installed!")
+    print("Install with: pip install ultralytics")
+    exit(1)
+
+DEFAULT_MODEL = Path('models') / 'default_yolo.pt'
+DEFAULT_CONF = 0.25
+DEFAULT_IOU = 0.45
+
+
+def load_model(file_path):
+    """Load YOLO model from given path (same as the desktop app)"""
+    return YOLO(str(file_path))
+
+
+def result_to_dict(result):
+    """Convert an ultralytics result into the fields shown on a detection card"""
+    detections = Detections.from_result(result)
+    height, width = detections.shape
+    return {
+        'width': int(width),
+        'height': int(height),
+        'count': len(detections),
+        'detections': detections.to_dicts()
+    }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent detection requests and runs them through the model
+    in small batches. The first request opens a time window of `max_wait`
+    seconds; everything that arrives within it (up to `max_batch` images)
+    shares a single predict() call.
+    """
+
+    def __init__(self, model, max_batch=8, max_wait=0.01):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.images = 0
+        self.running = True
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, image, conf=DEFAULT_CONF, iou=DEFAULT_IOU):
+        """Queue a BGR image for detection and return a Future for its result"""
+        future = Future()
+        self.queue.put((image, conf, iou, future))
+        return future
+
+    def stats(self):
+        """Return batching counters"""
+        with self.lock:
+            return {
+                'batches': self.batches,
+                'images': self.images,
+                'avg_batch_size': round(self.images / self.batches, 2) if self.batches else 0.0,
+                'max_batch': self.max_batch,
+                'max_wait_ms': self.max_wait * 1000
+            }
+
+    def close(self):
+        """Stop the worker thread"""
+        self.running = False
+        self.queue.put(None)
+        self.worker.join(timeout=5)
+
+    def _collect(self):
+        """Block for the first request, then gather more until the window closes"""
+        item = self.queue.get()
+        if item is None:
+            return []
+
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.running = False
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        """Worker loop - the only thread that touches the model"""
+        while self.running:
+            batch = self._collect()
+            if not batch:
+                break
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                # Never let one bad batch kill the only model thread
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process(self, batch):
+        """Run one collected batch and resolve its futures"""
+        # Requests with different thresholds cannot share a predict() call
+        groups = {}
+        for image, conf, iou, future in batch:
+            groups.setdefault((conf, iou), []).append((image, future))
+
+        for (conf, iou), items in groups.items():
+            images = [image for image, _ in items]
+            futures = [future for _, future in items]
+            start = time.perf_counter()
+            try:
+                results = self.model.predict(images, conf=conf, iou=iou, verbose=False)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for result, future in zip(results, futures):
+                try:
+                    data = result_to_dict(result)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                data['batch_size'] = len(items)
+                data['inference_ms'] = round(elapsed_ms, 2)
+                future.set_result(data)
+
+        with self.lock:
+            self.batches += len(groups)
+            self.images += len(batch)
+
+
+class DetectionRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP endpoints:
+        GET  /health   - model info
+        GET  /stats    - batching counters
+        POST /detect   - raw image body, multipart 'image' field,
+                         or JSON {"path": ..., "conf": ..., "iou": ...}
+    """
+
+    server_version = "YOLODetector/1.0"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self.send_json(200, {'status': 'ok', 'model': Path(self.server.model_path).name})
+        elif path == '/stats':
+            self.send_json(200, self.server.batcher.stats())
+        else:
+            self.send_json(404, {'error': f"Unknown endpoint: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/detect':
+            self.send_json(404, {'error': f"Unknown endpoint: {url.path}"})
+            return
+
+        try:
+            image, name, params = self.read_image(url)
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+
+        try:
+            conf = float(params.get('conf', DEFAULT_CONF))
+            iou = float(params.get('iou', DEFAULT_IOU))
+        except (TypeError, ValueError):
+            self.send_json(400, {'error': "conf and iou must be numbers"})
+            return
+        if not (0 <= conf <= 1 and 0 <= iou <= 1):
+            self.send_json(400, {'error': "conf and iou must be between 0 and 1"})
+            return
+
+        try:
+            data = self.server.batcher.submit(image, conf, iou).result(timeout=self.server.request_timeout)
+        except FutureTimeout:
+            self.send_json(504, {'error': "Detection timed out"})
+            return
+        except Exception as e:
+            self.send_json(500, {'error': f"Detection failed: {type(e).__name__}: {e}"})
+            return
+
+        data['image'] = name
+        self.send_json(200, data)
+
+    def read_image(self, url):
+        """Decode the request into (BGR image, display name, params)"""
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length', 0))
+        if length <= 0:
+            raise ValueError("Empty request body")
+        body = self.rfile.read(length)
+        content_type = self.headers.get('Content-Type', '')
+
+        if content_type.startswith('application/json'):
+            try:
+                payload = json.loads(body)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON: {e}")
+            if not isinstance(payload, dict) or 'path' not in payload:
+                raise ValueError("JSON body must be an object containing 'path'")
+            params.update({k: payload[k] for k in ('conf', 'iou') if k in payload})
+            image = cv2.imread(str(payload['path']))
+            if image is None:
+                raise ValueError(f"Could not read image: {payload['path']}")
+            return image, Path(payload['path']).name, params
+
+        name = params.get('name', 'upload')
+        if content_type.startswith('multipart/form-data'):
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+            )
+            for part in message.iter_parts():
+                if part.get_param('name', header='content-disposition') == 'image':
+                    name = part.get_filename() or name
+                    body = part.get_payload(decode=True)
+                    break
+            else:
+                raise ValueError("Multipart body must contain an 'image' field")
+
+        image = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Could not decode uploaded image")
+        return image, name, params
+
+
+class DetectionServer(ThreadingHTTPServer):
+    """Threaded HTTP server sharing one model through a MicroBatcher"""
+
+    daemon_threads = True
+
+    def __init__(self, address, model_path, max_batch=8, max_wait=0.01, request_timeout=60, quiet=False):
+        super().__init__(address, DetectionRequestHandler)
+        self.model_path = str(model_path)
+        self.model = load_model(model_path)
+        self.batcher = MicroBatcher(self.model, max_batch=max_batch, max_wait=max_wait)
+        self.request_timeout = request_timeout
+        self.quiet = quiet
+
+    def server_close(self):
+        self.batcher.close()
+        super().server_close()
+
+
+def main():
+    """Run the local inference server"""
+    parser = argparse.ArgumentParser(description="Local YOLO HTTP inference server")
+    parser.add_argument('--model', default=str(DEFAULT_MODEL), help="Path to .pt model")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch', type=int, default=8, help="Max images per predict() call")
+    parser.add_argument('--max-wait-ms', type=float, default=10.0,
+                        help="Batching window opened by the first queued request")
+    parser.add_argument('--quiet', action='store_true', help="Disable per-request logging")
+    args = parser.parse_args()
+
+    if not Path(args.model).exists():
+        print(f"ERROR: model not found: {args.model}")
+        exit(1)
+
+    server = DetectionServer(
+        (args.host, args.port), args.model,
+        max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000, quiet=args.quiet
+    )
+    print(f"Serving {Path(args.model).name} on http://{args.host}:{args.port} (POST /detect)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+import math
+import queue
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Beyond this stride, seeking is cheaper than grabbing every skipped frame
+SEEK_STRIDE = 30
+
+
+class VideoReader:
+    """
+    Frame reader over cv2.VideoCapture with a time range, frame stride,
+    optional downscaling and a background prefetch thread.
+
+    Skipped frames are grab()bed but never retrieve()d, so they cost no
+    colour conversion or copy; very long strides seek instead. Prefetched
+    frames are held in a bounded queue; for live cameras the queue holds only
+    the newest frame, so a slow consumer skips frames instead of lagging. The
+    isOpened()/read()/get()/release() surface matches cv2.VideoCapture.
+    """
+
+    def __init__(self, source, start=0.0, end=None, stride=1, max_size=None, prefetch=8):
+        self.cap = cv2.VideoCapture(source)
+        self.is_file = not isinstance(source, int)
+        self.stride = max(1, int(stride))
+        self.max_size = max_size
+        self.native_fps = self.cap.get(cv2.CAP_PROP_FPS) if self.is_file else 0.0
+        self.position = 0  # index of the next source frame
+        self.timestamp = 0.0  # media time of the last returned frame
+        self.frames_decoded = 0
+        self.finished = not self.cap.isOpened()
+        self.start_time = time.perf_counter()
+
+        self.end_frame = None
+        if self.is_file and self.native_fps > 0:
+            if start and start > 0:
+                self.cap.set(cv2.CAP_PROP_POS_MSEC, start * 1000)
+                self.position = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if end and end > 0:
+                self.end_frame = math.ceil(end * self.native_fps)
+
+        self.queue = None
+        self.stopping = False
+        if prefetch and not self.finished:
+            self.queue = queue.Queue(maxsize=prefetch if self.is_file else 1)
+            self.thread = threading.Thread(target=self._prefetch, daemon=True)
+            self.thread.start()
+
+    def isOpened(self):
+        return not self.finished
+
+    def get(self, prop):
+        """Like VideoCapture.get; CAP_PROP_FPS reports the rate after striding"""
+        if prop == cv2.CAP_PROP_FPS:
+            return self.native_fps / self.stride if self.native_fps else 0.0
+        return self.cap.get(prop)
+
+    def read(self):
+        """Return (ok, frame) for the next wanted frame"""
+        if self.finished:
+            return False, None
+
+        item = self.queue.get() if self.queue else self._decode_next()
+        if item is None:
+            self.finished = True
+            return False, None
+
+        if isinstance(item, Exception):
+            self.finished = True
+            raise item  # decoding failed on the prefetch thread
+
+        self.timestamp, frame = item
+        return True, frame
+
+    def release(self):
+        """Stop prefetching and close the capture"""
+        self.finished = True
+        if self.queue:
+            self.stopping = True
+            # Unblock the producer if it is waiting on a full queue
+            while self.thread.is_alive():
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self.thread.join(timeout=0.05)
+        self.cap.release()
+
+    def _skip(self, count):
+        """Advance `count` frames without decoding them into images"""
+        if count <= 0:
+            return True
+        if self.is_file and count >= SEEK_STRIDE:
+            self.position += count
+            return self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.position)
+        for _ in range(count):
+            if not self.cap.grab():
+                return False
+            self.position += 1
+        return True
+
+    def _decode_next(self):
+        """Return (timestamp, frame) for the next wanted frame, or None at the end"""
+        if self.frames_decoded:
+            if not self._skip(self.stride - 1):
+                return None
+
+        if self.end_frame is not None and self.position >= self.end_frame:
+            return None
+
+        ok, frame = self.cap.read()
+        if not ok:
+            return None
+
+        if self.native_fps:
+            timestamp = self.position / self.native_fps
+        else:
+            timestamp = time.perf_counter() - self.start_time
+        self.position += 1
+        self.frames_decoded += 1
+
+        if self.max_size and max(frame.shape[:2]) > self.max_size:
+            scale = self.max_size / max(frame.shape[:2])
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        return timestamp, frame
+
+    def _prefetch(self):
+        """Producer thread: keep the bounded queue filled"""
+        item = None
+        try:
+            while not self.stopping:
+                item = self._decode_next()
+                if item is None:
+                    break
+                if not self.is_file:
+                    # Live source: replace the unread frame rather than wait for the consumer
+                    try:
+                        self.queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                self.queue.put(item)
+        except Exception as e:
+            item = e
+        finally:
+            # Always end the stream so read() never blocks on a dead producer
+            if not isinstance(item, Exception):
+                item = None
+            self.queue.put(item)
+
+
+class FrameSource(ABC):
+    """
+    Base for cv2.VideoCapture-compatible sources that carry timestamps.
+
+    `pacing` controls how fast frames are handed out: 'realtime', a speed
+    factor such as 4.0, or 'fast' (as fast as the consumer reads).
+    """
+
+    def __init__(self, pacing='fast'):
+        self.speed = parse_pacing(pacing)
+        self.timestamp = 0.0
+        self.first_timestamp = None
+        self.clock_start = None
+        self.finished = False
+
+    def isOpened(self):
+        return not self.finished
+
+    def read(self):
+        if self.finished:
+            return False, None
+        item = self.next_frame()
+        if item is None:
+            self.finished = True
+            return False, None
+        self.timestamp, frame = item
+        self._pace(self.timestamp)
+        return True, frame
+
+    def get(self, prop):
+        return 0.0
+
+    def release(self):
+        self.finished = True
+
+    @abstractmethod
+    def next_frame(self):
+        """Return (timestamp, frame) or None at the end"""
+
+    def _pace(self, timestamp):
+        """Sleep until the frame is due on the replay clock"""
+        if not self.speed:
+            return
+        now = time.perf_counter()
+        if self.clock_start is None:
+            self.clock_start = now
+            self.first_timestamp = timestamp
+            return
+        due = self.clock_start + (timestamp - self.first_timestamp) / self.speed
+        if due > now:
+            time.sleep(due - now)
+
+
+def parse_pacing(pacing):
+    """'fast' -> None, 'realtime' -> 1.0, '4x' / 4 -> 4.0"""
+    if pacing in (None, 'fast'):
+        return None
+    if pacing == 'realtime':
+        return 1.0
+    speed = float(str(pacing).rstrip('x'))
+    if speed <= 0:
+        raise ValueError(f"Pacing speed must be positive: {pacing}")
+    return speed
+
+
+FRAME_LOG_MAGIC = b'YFRAMES1'
+FRAME_RECORD = struct.Struct('<dI')  # timestamp (s), JPEG length
+
+
+class FrameRecorder:
+    """
+    Appends frames to a compact on-disk frame log: a magic header followed
+    by (timestamp, length, JPEG bytes) records.
+    """
+
+    def __init__(self, path, quality=90):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, 'wb')
+        self.file.write(FRAME_LOG_MAGIC)
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        self.frames = 0
+
+    def write(self, frame, timestamp):
+        ok, data = cv2.imencode('.jpg', frame, self.params)
+        if not ok:
+            raise ValueError("Failed to encode frame")
+        self.file.write(FRAME_RECORD.pack(timestamp, len(data)))
+        self.file.write(data.tobytes())
+        self.frames += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class RecordingSource(FrameSource):
+    """Pass frames through from another source while recording them to a frame log"""
+
+    def __init__(self, source, path, quality=90):
+        super().__init__(pacing='fast')
+        self.source = source
+        self.recorder = FrameRecorder(path, quality)
+
+    def next_frame(self):
+        ok, frame = self.source.read()
+        if not ok:
+            return None
+        timestamp = getattr(self.source, 'timestamp', self.recorder.frames / 30.0)
+        self.recorder.write(frame, timestamp)
+        return timestamp, frame
+
+    def get(self, prop):
+        return self.source.get(prop)
+
+    def release(self):
+        super().release()
+        self.source.release()
+        self.recorder.close()
+
+
+class ReplaySource(FrameSource):
+    """
+    Replays a frame log written by FrameRecorder, optionally looping.
+    start/end (seconds into the log), stride and max_size sample the log
+    the same way VideoReader samples a video file.
+    """
+
+    def __init__(self, path, pacing='realtime', loop=False, start=0.0, end=None, stride=1, max_size=None):
+        super().__init__(pacing)
+        self.path = Path(path)
+        self.loop = loop
+        self.max_size = max_size
+        self.file = open(self.path, 'rb')
+        if self.file.read(len(FRAME_LOG_MAGIC)) != FRAME_LOG_MAGIC:
+            self.file.close()
+            raise ValueError(f"Not a frame log: {path}")
+
+        # Index record offsets and timestamps without decoding anything
+        self.offsets = []
+        self.timestamps = []
+        while True:
+            header = self.file.read(FRAME_RECORD.size)
+            if len(header) < FRAME_RECORD.size:
+                break
+            timestamp, length = FRAME_RECORD.unpack(header)
+            self.offsets.append(self.file.tell())
+            self.timestamps.append(timestamp)
+            self.file.seek(length, 1)
+
+        # Apply the time range and stride on the index, so skipped records are never read
+        if self.offsets and (start or end or stride > 1):
+            first = self.timestamps[0]
+            wanted = [
+                i for i, t in enumerate(self.timestamps)
+                if t - first >= (start or 0) and (not end or end <= 0 or t - first < end)
+            ][::max(1, int(stride))]
+            self.offsets = [self.offsets[i] for i in wanted]
+            self.timestamps = [self.timestamps[i] for i in wanted]
+
+        self.index = 0
+        self.loops = 0
+        self.finished = not self.offsets
+        self.duration = self.timestamps[-1] - self.timestamps[0] if self.offsets else 0.0
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return (len(self.offsets) - 1) / self.duration if self.duration > 0 else 0.0
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.offsets)
+        return 0.0
+
+    def next_frame(self):
+        if self.index >= len(self.offsets):
+            if not self.loop or not self.offsets:
+                return None
+            self.index = 0
+            self.loops += 1
+
+        self.file.seek(self.offsets[self.index] - FRAME_RECORD.size)
+        timestamp, length = FRAME_RECORD.unpack(self.file.read(FRAME_RECORD.size))
+        frame = cv2.imdecode(np.frombuffer(self.file.read(length), dtype=np.uint8), cv2.IMREAD_COLOR)
+        self.index += 1
+
+        if self.max_size and max(frame.shape[:2]) > self.max_size:
+            scale = self.max_size / max(frame.shape[:2])
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        # Keep the clock monotonic across loops
+        frame_period = self.duration / max(1, len(self.offsets) - 1)
+        return timestamp + self.loops * (self.duration + frame_period), frame
+
+    def release(self):
+        super().release()
+        self.file.close()
+
+
+class SyntheticSource(FrameSource):
+    """
+    Deterministic stand-in for a camera: a fixed background with a few
+    moving rectangles, so the video path can run without hardware.
+    start/end/stride/max_size sample it like VideoReader samples a file.
+    """
+
+    def __init__(self, frames=1000, width=640, height=480, fps=30.0, seed=0, pacing='fast',
+                 start=0.0, end=None, stride=1, max_size=None):
+        super().__init__(pacing)
+        self.frames = frames if not end or end <= 0 else min(frames, math.ceil(end * fps))
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.stride = max(1, int(stride))
+        self.max_size = max_size
+        self.position = int(round((start or 0) * fps))
+        rng = np.random.default_rng(seed)
+        self.background = rng.integers(0, 60, (height, width, 3), dtype=np.uint8)
+        self.objects = [
+            (rng.integers(40, 160, 2), rng.integers(-6, 7, 2), tuple(int(c) for c in rng.integers(80, 255, 3)))
+            for _ in range(4)
+        ]
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps / self.stride
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frames
+        return 0.0
+
+    def next_frame(self):
+        if self.position >= self.frames:
+            return None
+        frame = self.background.copy()
+        t = self.position
+        for size, velocity, color in self.objects:
+            x = int(abs((velocity[0] * t) % (2 * (self.width - size[0])) - (self.width - size[0])))
+            y = int(abs((velocity[1] * t) % (2 * (self.height - size[1])) - (self.height - size[1])))
+            cv2.rectangle(frame, (x, y), (x + int(size[0]), y + int(size[1])), color, -1)
+        self.position += self.stride
+
+        if self.max_size and max(frame.shape[:2]) > self.max_size:
+            scale = self.max_size / max(frame.shape[:2])
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return t / self.fps, frame
+
+
+def open_source(source, pacing='realtime', **reader_options):
+    """
+    Open a frame source from a webcam index, a video file, a frame log
+    (.framelog) or the string 'synthetic'.
+    """
+    if isinstance(source, int):
+        return VideoReader(source, **reader_options)
+    if str(source) == 'synthetic' or str(source).lower().endswith('.framelog'):
+        reader_options.pop('prefetch', None)  # generated and logged frames are read on demand
+        if str(source) == 'synthetic':
+            return SyntheticSource(pacing=pacing, **reader_options)
+        return ReplaySource(source, pacing=pacing, **reader_options)
+    return VideoReader(source, **reader_options)